@@ -1 +1,18 @@
 from .libEscansion import *         
+from .batch import scan_verse, scan_iter, scan_many, scan_annotated, scan_conllu, export_conllu
+from .annotations import read_conllu, write_conllu, save_serialized, load_serialized
+from .store import ResultStore
+from .corpus import scan_corpus, CorpusScan
+from .lexicon import Lexicon, LexiconTagger
+from .aio import ascan, AsyncScanner
+from .poem import scan_poem, PlayScan
+from .columns import write_columns, ColumnWriter, ColumnStore
+from .rhymes import RhymeIndex
+from .document import DocumentScan
+from .pool import PipelinePool, scan_threaded
+
+
+def __getattr__(name):
+    if name == 'nlp':
+        return get_pipeline()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
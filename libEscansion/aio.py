@@ -0,0 +1,178 @@
+"""Asynchronous scansion for asyncio applications.
+
+Concurrent requests are collected into micro-batches, which are tagged with a
+single pipeline call and scanned on a dedicated thread, so the event loop is
+never blocked:
+
+    verse = await libEscansion.ascan('Cerrar podrá mis ojos la postrera', [11])
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from .libEscansion import VerseMetre, Scansion
+from .batch import annotate
+
+# Default scanner of every event loop, with the task closing it when the loop shuts down
+_scanners = {}
+
+
+class AsyncScanner:
+    """
+    A class to scan verses from coroutines, by micro-batches.
+
+    A batch is closed when it holds max_batch verses or max_wait seconds after
+    its first verse arrived. While a batch is being scanned the next one keeps
+    filling. At most max_pending verses wait to be scanned; further requests
+    wait until there is room.
+    """
+
+    def __init__(self, max_batch=64, max_wait=0.005, max_pending=1024, executor=None, compact=False):
+        """
+        Initialize the AsyncScanner class.
+
+        :param max_batch: The maximum number of verses in a batch.
+        :param max_wait: The maximum time, in seconds, a batch waits for more verses.
+        :param max_pending: The maximum number of verses waiting to be scanned.
+        :param executor: The executor scanning the batches, or None for a dedicated thread.
+        :param compact: Boolean to return Scansion objects instead of VerseMetre objects.
+        """
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.compact = compact
+        self.batches = self.verses = 0
+        self.__queue = asyncio.Queue(max_pending)
+        self.__own_executor = executor is None
+        self.__executor = executor or ThreadPoolExecutor(1, thread_name_prefix='libEscansion')
+        self.__worker = None
+        self.__batch = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def scan(self, line, expected_syl=False, adso=False):
+        """
+        Scan a verse.
+
+        :param line: The verse.
+        :param expected_syl: The list of expected syllable counts, as in VerseMetre.
+        :param adso: Boolean to trigger specific behavior for 'adso' cases.
+        :return: A VerseMetre object, or a Scansion object if compact.
+        """
+        loop = asyncio.get_running_loop()
+        if self.__worker is None:
+            self.__worker = loop.create_task(self.__collect())
+        future = loop.create_future()
+        await self.__queue.put((line, expected_syl, adso, future))
+        return await future
+
+    async def __collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.__queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.__queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self.__batch = batch
+            results = await loop.run_in_executor(self.__executor, self.__scan_batch, batch)
+            self.__batch = []
+            self.batches += 1
+            self.verses += len(batch)
+            for (line, expected_syl, adso, future), (result, error) in zip(batch, results):
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+    def __scan_batch(self, batch):
+        """
+        Tag a batch of verses with a single pipeline call and scan them.
+
+        :param batch: A list of (verse, expected counts, adso, future) tuples.
+        :return: A list of (result, exception) tuples.
+        """
+        try:
+            docs = annotate([line for line, expected_syl, adso, future in batch])
+        except Exception as error:
+            return [(None, error)] * len(batch)
+        results = []
+        for (line, expected_syl, adso, future), doc in zip(batch, docs):
+            try:
+                verse = VerseMetre(line, expected_syl, adso, doc=doc)
+                results.append((Scansion.from_verse(verse) if self.compact else verse, None))
+            except Exception as error:
+                results.append((None, error))
+        return results
+
+    def pending(self):
+        """
+        Return the number of verses waiting to be scanned.
+
+        :return: The size of the queue.
+        """
+        return self.__queue.qsize()
+
+    async def close(self):
+        """Stop collecting verses, cancel those not scanned yet and release the executor."""
+        if self.__worker is not None:
+            self.__worker.cancel()
+            try:
+                await self.__worker
+            except asyncio.CancelledError:
+                pass
+            self.__worker = None
+        while not self.__queue.empty():
+            self.__batch.append(self.__queue.get_nowait())
+        for line, expected_syl, adso, future in self.__batch:
+            future.cancel()
+        self.__batch = []
+        if self.__own_executor:
+            self.__executor.shutdown(wait=False)
+
+
+async def _close_on_shutdown(loop, scanner):
+    """
+    Wait until the event loop shuts down, and then close its default scanner.
+
+    asyncio.run cancels the tasks still pending before closing the loop, this one included.
+
+    :param loop: The event loop.
+    :param scanner: Its default AsyncScanner.
+    """
+    try:
+        await loop.create_future()
+    finally:
+        _scanners.pop(loop, None)
+        await scanner.close()
+
+
+async def ascan(line, expected_syl=False, adso=False):
+    """
+    Scan a verse with the default scanner of the running event loop.
+
+    The scanner is created on first use and closed, with its thread, when the
+    tasks of the loop are cancelled on shutdown, as asyncio.run does. Those of
+    loops closed otherwise are dropped on the next call.
+
+    :param line: The verse.
+    :param expected_syl: The list of expected syllable counts, as in VerseMetre.
+    :param adso: Boolean to trigger specific behavior for 'adso' cases.
+    :return: A VerseMetre object.
+    """
+    loop = asyncio.get_running_loop()
+    for closed in [other for other in _scanners if other.is_closed()]:
+        del _scanners[closed]
+    if loop not in _scanners:
+        scanner = AsyncScanner()
+        _scanners[loop] = scanner, loop.create_task(_close_on_shutdown(loop, scanner))
+    scanner, closing = _scanners[loop]
+    return await scanner.scan(line, expected_syl, adso)
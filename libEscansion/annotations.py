@@ -0,0 +1,181 @@
+"""Linguistic annotations of verses, independent of Stanza.
+
+The classes mirror the attributes of Stanza's documents read by the scansion,
+so that verses tagged elsewhere can be scanned without loading any model.
+"""
+import pickle
+
+
+class Token:
+    """A class to represent a token, which may contain several words."""
+
+    def __init__(self, id, text):
+        self.id = id
+        self.text = text
+        self.words = []
+
+
+class Word:
+    """A class to represent a tagged word."""
+
+    def __init__(self, id, text, upos=None, feats=None, deprel=None, parent=None,
+                 lemma=None, xpos=None, head=None):
+        self.id = id
+        self.text = text
+        self.upos = upos
+        self.feats = feats
+        self.deprel = deprel
+        self.parent = parent
+        self.lemma = lemma
+        self.xpos = xpos
+        self.head = head
+
+    @property
+    def pos(self):
+        return self.upos
+
+    @pos.setter
+    def pos(self, value):
+        self.upos = value
+
+
+class Sentence:
+    """A class to represent a tagged sentence."""
+
+    def __init__(self, tokens, text=None):
+        self.tokens = tokens
+        self.words = [word for token in tokens for word in token.words]
+        self.text = text
+
+
+class Document:
+    """A class to represent the tagged text of a verse."""
+
+    def __init__(self, sentences, text=None):
+        self.sentences = sentences
+        self.text = text
+
+
+def _field(value):
+    return '_' if value is None or value == '' else str(value)
+
+
+def _value(field):
+    return None if field == '_' else field
+
+
+def write_conllu(fp, line, doc):
+    """
+    Write the annotation of a verse in CoNLL-U format.
+
+    Each verse is a CoNLL-U document, whose comments keep the original verse.
+
+    :param fp: A text file open for writing.
+    :param line: The verse.
+    :param doc: The tagged document of the verse, from Stanza or this module, or None.
+    """
+    fp.write(f'# newdoc\n# verse = {line}\n')
+    for sentence in doc.sentences if doc is not None else []:
+        if sentence.text:
+            fp.write(f'# text = {sentence.text}\n')
+        for token in sentence.tokens:
+            if len(token.words) > 1:
+                fp.write(f'{token.id[0]}-{token.id[-1]}\t{token.text}' + '\t_' * 8 + '\n')
+            for word in token.words:
+                fp.write('\t'.join((str(word.id), word.text, _field(word.lemma), _field(word.upos),
+                                    _field(word.xpos), _field(word.feats), _field(word.head),
+                                    _field(word.deprel), '_', '_')) + '\n')
+        fp.write('\n')
+    if doc is None or not doc.sentences:
+        fp.write('\n')
+
+
+def read_conllu(fp):
+    """
+    Read verses annotated in CoNLL-U format, as written by write_conllu.
+
+    Files without '# newdoc' comments are read as one verse per sentence.
+
+    :param fp: A text file open for reading.
+    :return: A generator of (verse, Document) tuples.
+    """
+    line = doc = None
+    tokens, text = [], None
+    documents = False
+
+    def sentence():
+        nonlocal line, tokens, text
+        if tokens:
+            doc.sentences.append(Sentence(tokens, text))
+            if line is None:
+                line = text if text is not None else ' '.join(token.text for token in tokens)
+        tokens, text = [], None
+
+    for row in fp:
+        row = row.rstrip('\n')
+        if row.startswith('#'):
+            key, _, value = row[1:].strip().partition('=')
+            key = key.strip()
+            if key == 'newdoc':
+                if doc is not None:
+                    sentence()
+                    yield line, doc
+                documents = True
+                line, doc = '', Document([])
+            elif key == 'verse':
+                line = value[1:] if value.startswith(' ') else value
+            elif key == 'text':
+                text = value.strip()
+        elif not row.strip():
+            if doc is not None:
+                sentence()
+                if not documents:
+                    yield line, doc
+                    doc = None
+        else:
+            if doc is None:
+                line, doc = None, Document([])
+            columns = row.split('\t')
+            if '-' in columns[0]:
+                first, last = (int(x) for x in columns[0].split('-'))
+                tokens.append(Token((first, last), columns[1]))
+            elif '.' not in columns[0]:
+                id = int(columns[0])
+                if not tokens or tokens[-1].id[-1] < id:
+                    tokens.append(Token((id,), columns[1]))
+                token = tokens[-1]
+                word = Word(id, columns[1], upos=_value(columns[3]), feats=_value(columns[5]),
+                            deprel=_value(columns[7]), parent=token, lemma=_value(columns[2]),
+                            xpos=_value(columns[4]), head=_value(columns[6]))
+                token.words.append(word)
+    if doc is not None:
+        sentence()
+        if documents or doc.sentences:
+            yield line, doc
+
+
+def save_serialized(fp, line, doc):
+    """
+    Append a verse and its Stanza document, serialized by Stanza, to a binary file.
+
+    :param fp: A binary file open for writing.
+    :param line: The verse.
+    :param doc: A stanza Document, or None.
+    """
+    pickle.dump((line, doc.to_serialized() if doc is not None else None), fp)
+
+
+def load_serialized(fp):
+    """
+    Read the verses and Stanza documents written by save_serialized.
+
+    :param fp: A binary file open for reading.
+    :return: A generator of (verse, stanza Document) tuples.
+    """
+    from stanza import Document as StanzaDocument
+    while True:
+        try:
+            line, serialized = pickle.load(fp)
+        except EOFError:
+            return
+        yield line, StanzaDocument.from_serialized(serialized) if serialized is not None else None
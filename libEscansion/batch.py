@@ -0,0 +1,158 @@
+"""Batched scansion: verses are tagged by chunks in a single pipeline call."""
+from itertools import islice
+from .libEscansion import VerseMetre, Scansion, get_pipeline, prepare_line
+from .annotations import read_conllu, write_conllu
+
+chunk_size = 64
+
+
+def annotate(lines, pipeline=None):
+    """
+    Tag a list of verses with a single call to the pipeline.
+
+    Each verse is a document of its own, so that Stanza processes them in bulk.
+
+    :param lines: A list of verses.
+    :param pipeline: The pipeline to use, or None for the shared one.
+    :return: A list with a tagged document for each verse, or None for empty verses.
+    """
+    indices = [idx for idx, line in enumerate(lines) if line]
+    docs = [None] * len(lines)
+    if indices:
+        import stanza
+        tagged = (pipeline or get_pipeline())([stanza.Document([], text=prepare_line(lines[idx])) for idx in indices])
+        for idx, doc in zip(indices, tagged):
+            docs[idx] = doc
+    return docs
+
+
+def chunks(lines, size):
+    """
+    Split an iterable of verses into lists of a given size.
+
+    :param lines: An iterable of verses.
+    :param size: The number of verses in each chunk.
+    :return: A generator of lists of verses.
+    """
+    lines = iter(lines)
+    while chunk := list(islice(lines, size)):
+        yield chunk
+
+
+def scan_verse(line, expected_syl=False, adso=False, doc=None, compact=False, errors='raise'):
+    """
+    Scan a verse, following a policy for the verses that cannot be scanned.
+
+    :param line: The verse.
+    :param expected_syl: The list of expected syllable counts, as in VerseMetre.
+    :param adso: Boolean to trigger specific behavior for 'adso' cases.
+    :param doc: An optional document already tagged for the verse.
+    :param compact: Boolean to return a Scansion object and drop the analysis of the verse.
+    :param errors: 'raise' to raise the exception of a verse that cannot be scanned, or 'return' to return it.
+    :return: A VerseMetre object, a Scansion object if compact, or the exception raised.
+    """
+    if errors not in ('raise', 'return'):
+        raise ValueError(f"errors must be 'raise' or 'return', not {errors!r}")
+    try:
+        verse = VerseMetre(line, expected_syl, adso, doc=doc)
+    except Exception as error:
+        if errors == 'raise':
+            raise
+        return error
+    return Scansion.from_verse(verse) if compact else verse
+
+
+def scan_iter(lines, expected_syl=False, adso=False, size=None, store=None, compact=False, errors='raise'):
+    """
+    Scan an iterable of verses, tagging them by chunks.
+
+    Only one chunk is held in memory at a time and the results are yielded in
+    the order of the input. Verses found in the store are not scanned again,
+    and the new ones are added to it. With errors='raise', the first verse
+    that cannot be scanned ends the generator; with errors='return', its
+    exception is yielded in its place and the scansion goes on.
+
+    :param lines: An iterable of verses.
+    :param expected_syl: The list of expected syllable counts, as in VerseMetre.
+    :param adso: Boolean to trigger specific behavior for 'adso' cases.
+    :param size: The number of verses tagged in each pipeline call.
+    :param store: An optional ResultStore.
+    :param compact: Boolean to yield Scansion objects and drop the analysis of the verses.
+    :param errors: 'raise' or 'return', as in scan_verse.
+    :return: A generator of VerseMetre objects, or of Scansion objects if compact, and of exceptions.
+    """
+    for chunk in chunks(lines, size or chunk_size):
+        if store is None:
+            for line, doc in zip(chunk, annotate(chunk)):
+                yield scan_verse(line, expected_syl, adso, doc, compact, errors)
+            continue
+        verses = [store.get(line, expected_syl, adso) for line in chunk]
+        docs = iter(annotate([line for line, verse in zip(chunk, verses) if verse is None]))
+        for line, verse in zip(chunk, verses):
+            if verse is None:
+                verse = scan_verse(line, expected_syl, adso, next(docs), errors=errors)
+                if isinstance(verse, Exception):
+                    yield verse
+                    continue
+                store.put(verse, expected_syl)
+            yield Scansion.from_verse(verse) if compact else verse
+        store.commit()
+
+
+def scan_annotated(annotated, expected_syl=False, adso=False, compact=False, errors='raise'):
+    """
+    Scan verses already tagged, without calling the pipeline.
+
+    :param annotated: An iterable of (verse, document) tuples, e.g. from read_conllu.
+    :param expected_syl: The list of expected syllable counts, as in VerseMetre.
+    :param adso: Boolean to trigger specific behavior for 'adso' cases.
+    :param compact: Boolean to yield Scansion objects and drop the analysis of the verses.
+    :param errors: 'raise' or 'return', as in scan_iter.
+    :return: A generator of VerseMetre objects, or of Scansion objects if compact, and of exceptions.
+    """
+    for line, doc in annotated:
+        yield scan_verse(line, expected_syl, adso, doc, compact, errors)
+
+
+def export_conllu(lines, fp, size=None):
+    """
+    Tag verses by chunks and write their annotations in CoNLL-U format.
+
+    :param lines: An iterable of verses.
+    :param fp: A text file open for writing.
+    :param size: The number of verses tagged in each pipeline call.
+    """
+    for chunk in chunks(lines, size or chunk_size):
+        for line, doc in zip(chunk, annotate(chunk)):
+            write_conllu(fp, line, doc)
+
+
+def scan_conllu(fp, expected_syl=False, adso=False, compact=False, errors='raise'):
+    """
+    Scan the verses of a CoNLL-U file written by export_conllu.
+
+    :param fp: A text file open for reading.
+    :param expected_syl: The list of expected syllable counts, as in VerseMetre.
+    :param adso: Boolean to trigger specific behavior for 'adso' cases.
+    :param compact: Boolean to yield Scansion objects and drop the analysis of the verses.
+    :param errors: 'raise' or 'return', as in scan_iter.
+    :return: A generator of VerseMetre objects, or of Scansion objects if compact, and of exceptions.
+    """
+    return scan_annotated(read_conllu(fp), expected_syl, adso, compact, errors)
+
+
+def scan_many(lines, expected_syl=False, adso=False, size=None, store=None, compact=False, errors='raise'):
+    """
+    Scan a list of verses, tagging them by chunks.
+
+    :param lines: An iterable of verses.
+    :param expected_syl: The list of expected syllable counts, as in VerseMetre.
+    :param adso: Boolean to trigger specific behavior for 'adso' cases.
+    :param size: The number of verses tagged in each pipeline call.
+    :param store: An optional ResultStore.
+    :param compact: Boolean to return Scansion objects and drop the analysis of the verses.
+    :param errors: 'raise' to raise the exception of the first verse that cannot be scanned, discarding
+                   the results, or 'return' to put the exception in the place of the verse.
+    :return: A list of VerseMetre objects, or of Scansion objects if compact, in the order of the input.
+    """
+    return list(scan_iter(lines, expected_syl, adso, size, store, compact, errors))
@@ -0,0 +1,222 @@
+"""Benchmark of the scansion pipeline, stage by stage.
+
+The bundled corpus is scanned with and without 'adso', timing each stage of
+the pipeline per verse. The report can be saved and compared with a previous
+one, failing if any measure regresses beyond a threshold:
+
+    python -m libEscansion.benchmark --save baseline.json
+    python -m libEscansion.benchmark --baseline baseline.json --threshold 0.1
+"""
+import sys
+import json
+import argparse
+import tracemalloc
+from time import perf_counter
+from contextlib import contextmanager
+from importlib.resources import files
+from .libEscansion import PlayLine, VerseMetre, clear_caches, version
+
+# Stages timed, and the methods implementing them. Adjusting the metre
+# includes finding the synaloephas and hiatuses it resolves the counts from.
+stages = {
+    'preprocess': (PlayLine, '_PlayLine__preprocess'),
+    'set_features': (PlayLine, '_PlayLine__set_features'),
+    'find_prosodic_stress': (PlayLine, '_PlayLine__find_prosodic_stress'),
+    'find_synaloephas': (VerseMetre, '_VerseMetre__find_synaloephas'),
+    'adjust_metre': (VerseMetre, '_VerseMetre__adjust_metre'),
+}
+
+
+def load_corpus():
+    """
+    Load the bundled corpus.
+
+    :return: A list of (expected syllables, verse) tuples.
+    """
+    corpus = []
+    for row in files(__package__).joinpath('data', 'benchmark.tsv').read_text(encoding='utf-8').splitlines():
+        if row.strip():
+            metre, line = row.split('\t', 1)
+            corpus.append((int(metre), line))
+    return corpus
+
+
+class StageTimer:
+    """
+    Class to time the stages of the pipeline by wrapping their methods.
+    """
+
+    def __init__(self):
+        self.times = dict.fromkeys(stages, 0.0)
+        self.__depth = dict.fromkeys(stages, 0)
+
+    def __wrap(self, name, method):
+        def timed(*args, **kwargs):
+            if self.__depth[name]:
+                return method(*args, **kwargs)
+            self.__depth[name] += 1
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.times[name] += perf_counter() - start
+                self.__depth[name] -= 1
+        return timed
+
+    def reset(self):
+        """
+        Return the times accumulated since the last reset and start again.
+
+        :return: A dictionary with the seconds spent in each stage.
+        """
+        times, self.times = self.times, dict.fromkeys(stages, 0.0)
+        return times
+
+    @contextmanager
+    def installed(self):
+        """Time the stages while the context is active."""
+        originals = {name: getattr(cls, method) for name, (cls, method) in stages.items()}
+        try:
+            for name, (cls, method) in stages.items():
+                setattr(cls, method, self.__wrap(name, originals[name]))
+            yield self
+        finally:
+            for name, (cls, method) in stages.items():
+                setattr(cls, method, originals[name])
+
+
+def percentile(data, percent):
+    """
+    Return a percentile of a list of values, by the nearest-rank method.
+
+    :param data: A list of values.
+    :param percent: The percentile, from 0 to 100.
+    :return: The value at the percentile.
+    """
+    data = sorted(data)
+    return data[max(0, min(len(data) - 1, -(-len(data) * percent // 100) - 1))] if data else 0.0
+
+
+def scan(corpus, adso_modes):
+    errors = 0
+    for expected, line in corpus:
+        for adso in adso_modes:
+            try:
+                VerseMetre(line, [expected], adso)
+            except IndexError:
+                errors += 1
+            yield
+    return errors
+
+
+def run(corpus=None, repeat=3, adso_modes=(False, True), cold=False):
+    """
+    Scan the corpus, timing each stage per verse.
+
+    A first pass warms up the pipeline and the caches, unless cold is set, in
+    which case the caches are emptied before every repetition.
+
+    :param corpus: A list of (expected syllables, verse) tuples, by default the bundled one.
+    :param repeat: The number of times the corpus is scanned.
+    :param adso_modes: The values of adso each verse is scanned with.
+    :param cold: Boolean to empty the caches before every repetition.
+    :return: A dictionary with the report.
+    """
+    corpus = corpus or load_corpus()
+    timer = StageTimer()
+    samples = {name: [] for name in stages}
+    totals = []
+    if not cold:
+        for _ in scan(corpus, adso_modes):
+            pass
+    with timer.installed():
+        elapsed = 0.0
+        for _ in range(repeat):
+            if cold:
+                clear_caches()
+            start = perf_counter()
+            verses = scan(corpus, adso_modes)
+            while True:
+                verse_start = perf_counter()
+                try:
+                    next(verses)
+                except StopIteration as stop:
+                    errors = stop.value
+                    break
+                totals.append(perf_counter() - verse_start)
+                for name, seconds in timer.reset().items():
+                    samples[name].append(seconds)
+            elapsed += perf_counter() - start
+
+    tracemalloc.start()
+    for _ in scan(corpus, adso_modes):
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    def latency(data):
+        return {'p50': percentile(data, 50) * 1000, 'p99': percentile(data, 99) * 1000}
+
+    return {
+        'version': version,
+        'verses': len(totals),
+        'errors': errors,
+        'lines_per_second': len(totals) / elapsed if elapsed else 0.0,
+        'latency_ms': {'total': latency(totals), **{name: latency(data) for name, data in samples.items()}},
+        'peak_memory': peak,
+    }
+
+
+def compare(report, baseline, threshold=0.1):
+    """
+    Compare a report with a baseline.
+
+    :param report: The current report.
+    :param baseline: A previous report.
+    :param threshold: The relative change tolerated, e.g. 0.1 for 10 %.
+    :return: A list of descriptions of the regressions found.
+    """
+    regressions = []
+    old, new = baseline['lines_per_second'], report['lines_per_second']
+    if new < old * (1 - threshold):
+        regressions.append(f'lines/s: {old:.1f} -> {new:.1f}')
+    for stage, latency in report['latency_ms'].items():
+        for measure, value in latency.items():
+            old = baseline['latency_ms'].get(stage, {}).get(measure)
+            if old and value > old * (1 + threshold):
+                regressions.append(f'{stage} {measure}: {old:.3f} -> {value:.3f} ms')
+    old, new = baseline['peak_memory'], report['peak_memory']
+    if new > old * (1 + threshold):
+        regressions.append(f'peak memory: {old} -> {new} bytes')
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m libEscansion.benchmark',
+                                     description='Benchmark of the scansion pipeline.')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='times the corpus is scanned')
+    parser.add_argument('-c', '--cold', action='store_true', help='empty the caches before every repetition')
+    parser.add_argument('-b', '--baseline', help='report to compare with')
+    parser.add_argument('-t', '--threshold', type=float, default=0.1, help='relative regression tolerated')
+    parser.add_argument('-s', '--save', help='file to save the report to')
+    args = parser.parse_args(argv)
+
+    report = run(repeat=args.repeat, cold=args.cold)
+    print(f"{report['verses']} verses, {report['lines_per_second']:.1f} lines/s, "
+          f"peak memory {report['peak_memory'] / 2 ** 20:.1f} MiB")
+    for stage, latency in report['latency_ms'].items():
+        print(f"{stage:22} p50 {latency['p50']:8.3f} ms   p99 {latency['p99']:8.3f} ms")
+    if args.save:
+        with open(args.save, 'w') as fp:
+            json.dump(report, fp, indent=2)
+    if args.baseline:
+        with open(args.baseline) as fp:
+            regressions = compare(report, json.load(fp), args.threshold)
+        for regression in regressions:
+            print(f'Regression: {regression}')
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""Bounded in-memory caches with usage statistics, safe to share between threads."""
+from collections import OrderedDict
+from threading import Lock
+
+
+class LRUCache:
+    """
+    A bounded mapping that discards the least recently used entries.
+    """
+
+    def __init__(self, maxsize=4096):
+        """
+        Initialize the LRUCache class.
+
+        :param maxsize: The maximum number of entries kept.
+        """
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+        self.__data = OrderedDict()
+        self.__lock = Lock()
+
+    def __len__(self):
+        return len(self.__data)
+
+    def get(self, key, default=None):
+        """
+        Return the value cached for a key and mark it as recently used.
+
+        :param key: The key to look up.
+        :param default: The value returned if the key is not cached.
+        :return: The cached value or the default.
+        """
+        with self.__lock:
+            try:
+                value = self.__data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self.__data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Cache a value, evicting the least recently used entries if full.
+
+        :param key: The key.
+        :param value: The value to cache.
+        """
+        with self.__lock:
+            self.__data[key] = value
+            self.__data.move_to_end(key)
+            self.__trim()
+
+    def resize(self, maxsize):
+        """
+        Change the maximum number of entries kept.
+
+        :param maxsize: The new maximum number of entries.
+        """
+        with self.__lock:
+            self.maxsize = maxsize
+            self.__trim()
+
+    def clear(self):
+        """Discard all the entries and reset the statistics."""
+        with self.__lock:
+            self.__data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Return the usage statistics of the cache.
+
+        :return: A dictionary with hits, misses, evictions, size and maxsize.
+        """
+        with self.__lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'size': len(self.__data), 'maxsize': self.maxsize}
+
+    def __trim(self):
+        while len(self.__data) > self.maxsize:
+            self.__data.popitem(last=False)
+            self.evictions += 1
@@ -0,0 +1,121 @@
+"""Console command to scan corpora of verses."""
+import sys
+import json
+import time
+import argparse
+from .libEscansion import VerseMetre
+from .batch import chunks, chunk_size
+from .corpus import CorpusScan, read_verses, scan_verses
+from .tei import rhythm_matches
+from .evaluation import gold_metre
+
+columns = ('source', 'n', 'line') + VerseMetre.fields + ('met', 'error')
+
+
+class ResultWriter:
+    """
+    Class to write scansion results to a buffered file as JSON Lines or TSV.
+    """
+
+    def __init__(self, path, format='jsonl', buffering=1 << 20):
+        """
+        Initialize the ResultWriter class.
+
+        :param path: The path of the output file, or '-' for the standard output.
+        :param format: Either 'jsonl' or 'tsv'.
+        :param buffering: The size of the write buffer in bytes.
+        """
+        self.format = format
+        self.fp = sys.stdout if path == '-' else open(path, 'w', encoding='utf-8', buffering=buffering)
+        if format == 'tsv':
+            self.fp.write('\t'.join(columns) + '\n')
+
+    def write(self, result):
+        """
+        Write the result of a verse.
+
+        :param result: A dictionary as returned by scan_verses.
+        """
+        if self.format == 'tsv':
+            row = {**result, 'met': result.get('attributes', {}).get('met')}
+            values = [row.get(column) for column in columns]
+            self.fp.write('\t'.join('' if value is None else value if isinstance(value, str)
+                                    else json.dumps(value, ensure_ascii=False) for value in values) + '\n')
+        else:
+            self.fp.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+    def close(self):
+        """Flush and close the file."""
+        if self.fp is sys.stdout:
+            self.fp.flush()
+        else:
+            self.fp.close()
+
+
+def results(args):
+    """
+    Scan the files in the order given, in this process or with a pool of workers.
+
+    :param args: The parsed command line arguments.
+    :return: A generator of result dictionaries.
+    """
+    if args.workers > 1:
+        yield from CorpusScan(args.files, args.workers, args.expected, args.adso, args.size)
+    else:
+        verses = (verse for path in args.files for verse in read_verses(path))
+        for chunk in chunks(verses, args.size):
+            yield from scan_verses(chunk, args.expected, args.adso)
+
+
+def main(argv=None):
+    """
+    Scan plain text, CoNLL-U or TEI files and write the results.
+
+    :param argv: The command line arguments.
+    :return: The exit status.
+    """
+    parser = argparse.ArgumentParser(prog='escansion', description='Metrical scansion of Spanish verses.')
+    parser.add_argument('files', nargs='+', help='TEI (.xml), CoNLL-U (.conllu) or plain text files')
+    parser.add_argument('-e', '--expected', type=int, nargs='+', default=False,
+                        help='expected syllable counts, in order of preference')
+    parser.add_argument('-a', '--adso', action='store_true', help='unstressed interjections, as in ADSO')
+    parser.add_argument('-o', '--output', default='-', help='output file (default: standard output)')
+    parser.add_argument('-f', '--format', choices=('jsonl', 'tsv'), default='jsonl')
+    parser.add_argument('-m', '--mismatches', help='file for the verses whose rhythm differs from their met attribute')
+    parser.add_argument('-s', '--size', type=int, default=chunk_size, help='verses tagged in each pipeline call')
+    parser.add_argument('-w', '--workers', type=int, default=1, help='number of worker processes')
+    parser.add_argument('-p', '--progress', type=int, default=1000,
+                        help='report progress every so many verses (0 to disable)')
+    args = parser.parse_args(argv)
+
+    output = ResultWriter(args.output, args.format)
+    mismatches = ResultWriter(args.mismatches, args.format) if args.mismatches else None
+    total = failed = errors = 0
+    start = time.perf_counter()
+    try:
+        for result in results(args):
+            total += 1
+            output.write(result)
+            if 'error' in result:
+                errors += 1
+            elif (gold := gold_metre(result.get('attributes', {}), ('met',))) is not None:
+                count, rhythm = gold
+                if not (rhythm_matches(result['rhythm'], rhythm) if rhythm else result['count'] == count):
+                    failed += 1
+                    if mismatches:
+                        mismatches.write(result)
+            if args.progress and total % args.progress == 0:
+                elapsed = time.perf_counter() - start
+                print(f'{total} verses, {total / elapsed:.1f} verses/s, '
+                      f'{failed} mismatches, {errors} errors', file=sys.stderr)
+    finally:
+        output.close()
+        if mismatches:
+            mismatches.close()
+    elapsed = time.perf_counter() - start
+    print(f'{total} verses in {elapsed:.1f} s, {failed} mismatches, {errors} errors', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""Client of the local scansion server.
+
+The module imports only the standard library. Imported as part of the
+package it also loads fonemas and silabeador, through the package, but never
+Stanza or its models. To use the client without the package installed, the
+file can be copied and run on its own. The verses of a file or of the
+standard input can be scanned with:
+
+    python -m libEscansion.client --socket /tmp/escansion.sock --expected 11 7 < sonnet.txt
+    python client.py --socket /tmp/escansion.sock < sonnet.txt
+"""
+import sys
+import json
+import socket
+import argparse
+
+
+class Client:
+    """
+    A class to scan verses with a running scansion server.
+    """
+
+    def __init__(self, path=None, host='127.0.0.1', port=8765, timeout=None):
+        """
+        Connect to the server.
+
+        :param path: The path of the Unix socket of the server, or None to connect by TCP.
+        :param host: The host of the server.
+        :param port: The port of the server.
+        :param timeout: The timeout of the socket, in seconds.
+        """
+        if path:
+            self.__socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.__socket.settimeout(timeout)
+            self.__socket.connect(path)
+        else:
+            self.__socket = socket.create_connection((host, port), timeout)
+        self.__reader = self.__socket.makefile('r', encoding='utf-8')
+        self.__writer = self.__socket.makefile('w', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def request(self, requests):
+        """
+        Send requests and read their responses, which keep the same order.
+
+        :param requests: A list of dictionaries.
+        :return: A list of dictionaries.
+        """
+        for request in requests:
+            self.__writer.write(json.dumps(request, ensure_ascii=False) + '\n')
+        self.__writer.flush()
+        return [json.loads(self.__reader.readline()) for request in requests]
+
+    def scan(self, line, expected_syl=False, adso=False):
+        """
+        Scan a verse.
+
+        :param line: The verse.
+        :param expected_syl: The list of expected syllable counts, as in VerseMetre.
+        :param adso: Boolean to trigger specific behavior for 'adso' cases.
+        :return: A dictionary with the fields of VerseMetre, or with an error.
+        """
+        return self.scan_many([line], expected_syl, adso)[0]
+
+    def scan_many(self, lines, expected_syl=False, adso=False):
+        """
+        Scan a list of verses, sending them all before reading the results.
+
+        :param lines: A list of verses.
+        :param expected_syl: The list of expected syllable counts, as in VerseMetre.
+        :param adso: Boolean to trigger specific behavior for 'adso' cases.
+        :return: A list of dictionaries in the order of the input.
+        """
+        return self.request([{'line': line, 'expected_syl': expected_syl, 'adso': adso} for line in lines])
+
+    def health(self):
+        """
+        Return the counters of the server.
+
+        :return: A dictionary.
+        """
+        return self.request([{'op': 'health'}])[0]
+
+    def close(self):
+        """Close the connection."""
+        self.__writer.close()
+        self.__reader.close()
+        self.__socket.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m libEscansion.client',
+                                     description='Scan verses with a running scansion server.')
+    parser.add_argument('files', nargs='*', help='files with one verse per line (default: standard input)')
+    parser.add_argument('-S', '--socket', help='path of the Unix socket of the server')
+    parser.add_argument('-H', '--host', default='127.0.0.1', help='host of the server')
+    parser.add_argument('-P', '--port', type=int, default=8765, help='port of the server')
+    parser.add_argument('-e', '--expected', type=int, nargs='+', default=False, help='expected syllable counts')
+    parser.add_argument('-a', '--adso', action='store_true', help='unstressed interjections, as in ADSO')
+    parser.add_argument('--health', action='store_true', help='print the counters of the server')
+    args = parser.parse_args(argv)
+
+    with Client(args.socket, args.host, args.port) as client:
+        if args.health:
+            print(json.dumps(client.health()))
+            return 0
+        lines = []
+        for path in args.files:
+            with open(path, encoding='utf-8') as fp:
+                lines.extend(row.rstrip('\n') for row in fp if row.strip())
+        if not args.files:
+            lines.extend(row.rstrip('\n') for row in sys.stdin if row.strip())
+        for result in client.scan_many(lines, args.expected, args.adso):
+            print(json.dumps(result, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
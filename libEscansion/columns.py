@@ -0,0 +1,305 @@
+"""Columnar files of scansion results, read through memory mapping.
+
+The numeric results are stored in fixed-width columns and the strings in
+pools indexed by offsets, so that a reader can take a column or a single verse
+without parsing or copying the rest of the file:
+
+    >>> libEscansion.write_columns('corpus.esc', scan_corpus(paths))
+    >>> with libEscansion.ColumnStore('corpus.esc') as store:
+    ...     counts = store.column('count')
+    ...     store.row(1000)
+
+The file starts with a magic number and a JSON header describing the columns,
+followed by their data, each section aligned to 8 bytes.
+"""
+import sys
+import json
+import mmap
+from array import array
+from .libEscansion import version
+
+magic = b'ESCCOL1\0'
+
+# Fixed-width columns and their array typecodes
+numeric = {'count': 'h', 'natural': 'h', 'estimate': 'h', 'ambiguity': 'h', 'n': 'i', 'source': 'i'}
+# Columns stored in string pools; the syllables and expected counts as JSON
+strings = ('line', 'rhythm', 'nuclei', 'asson', 'rhyme', 'syllables', 'expected_syl', 'error')
+
+encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+class ColumnWriter:
+    """
+    A class to write scansion results to a columnar file.
+
+    The columns are kept in compact arrays until the file is closed.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the ColumnWriter class.
+
+        :param path: The path of the file.
+        """
+        self.path = path
+        self.__numeric = {name: array(code) for name, code in numeric.items()}
+        self.__data = {name: bytearray() for name in strings}
+        self.__offsets = {name: array('q', [0]) for name in strings}
+        self.__sources = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return len(self.__numeric['count'])
+
+    def add(self, result, source=None, n=None):
+        """
+        Add the results of a verse.
+
+        :param result: A VerseMetre or Scansion object, or a dictionary as returned by to_dict or scan_corpus.
+        :param source: The source of the verse, if not in the result.
+        :param n: The number of the verse in its source, if not in the result.
+        """
+        get = result.get if isinstance(result, dict) else lambda field: getattr(result, field, None)
+        source = source if source is not None else get('source')
+        n = n if n is not None else get('n')
+        columns = self.__numeric
+        columns['source'].append(self.__sources.setdefault(source or '', len(self.__sources)))
+        columns['n'].append(n if n is not None else len(self) + 1)
+        for name in ('count', 'natural', 'estimate', 'ambiguity'):
+            columns[name].append(get(name) or 0)
+        for name in strings:
+            value = get(name)
+            if name in ('syllables', 'expected_syl'):
+                value = encoder.encode(value or [])
+            data = self.__data[name]
+            data += value.encode('utf-8') if value else b''
+            self.__offsets[name].append(len(data))
+
+    def extend(self, results):
+        """
+        Add the results of several verses.
+
+        :param results: An iterable of results, as in add.
+        """
+        for result in results:
+            self.add(result)
+
+    def close(self):
+        """Write the file."""
+        sections, columns = [], {}
+        for name, values in self.__numeric.items():
+            sections.append(values.tobytes())
+            columns[name] = {'type': values.typecode}
+        for name in strings:
+            sections.append(self.__offsets[name].tobytes())
+            sections.append(bytes(self.__data[name]))
+            columns[name] = {'type': 'strings'}
+        header = {'version': version, 'byteorder': sys.byteorder, 'rows': len(self),
+                  'sources': list(self.__sources), 'columns': columns}
+
+        # The offsets of the sections depend on the size of the header, which holds them
+        start, encoded = 0, b''
+        while len(magic) + 8 + len(encoded) > start:
+            start = self.__align(len(magic) + 8 + len(encoded) + 256)
+            layout, position = [], start
+            for section in sections:
+                layout.append(position)
+                position = self.__align(position + len(section))
+            sizes = iter(zip(layout, sections))
+            for name in numeric:
+                offset, section = next(sizes)
+                columns[name].update(offset=offset, size=len(section))
+            for name in strings:
+                (offsets, _), (data, section) = next(sizes), next(sizes)
+                columns[name].update(offsets=offsets, data=data, size=len(section))
+            encoded = json.dumps(header, ensure_ascii=False).encode('utf-8')
+
+        with open(self.path, 'wb') as fp:
+            fp.write(magic + len(encoded).to_bytes(8, 'little') + encoded)
+            for offset, section in zip(layout, sections):
+                fp.write(b'\0' * (offset - fp.tell()))
+                fp.write(section)
+
+    @staticmethod
+    def __align(position):
+        return (position + 7) // 8 * 8
+
+
+def write_columns(path, results):
+    """
+    Write scansion results to a columnar file.
+
+    :param path: The path of the file.
+    :param results: An iterable of VerseMetre or Scansion objects, or of dictionaries as returned by scan_corpus.
+    :return: The number of verses written.
+    """
+    with ColumnWriter(path) as writer:
+        writer.extend(results)
+    return len(writer)
+
+
+class StringColumn:
+    """
+    A class to represent a column of strings stored in a pool.
+
+    The strings are decoded only when they are read.
+    """
+
+    def __init__(self, offsets, data):
+        """
+        Initialize the StringColumn class.
+
+        :param offsets: A memoryview of the offsets of the strings in the pool.
+        :param data: A memoryview of the pool.
+        """
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[item] for item in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        return str(self.data[self.offsets[idx]:self.offsets[idx + 1]], 'utf-8')
+
+    def __iter__(self):
+        return (self[idx] for idx in range(len(self)))
+
+
+class ColumnStore:
+    """
+    A class to read a columnar file of scansion results through memory mapping.
+    """
+
+    def __init__(self, path):
+        """
+        Open the file.
+
+        :param path: The path of the file.
+        """
+        self.path = path
+        with open(path, 'rb') as fp:
+            self.__map = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__view = memoryview(self.__map)
+        if bytes(self.__view[:len(magic)]) != magic:
+            raise ValueError(f'{path} is not a columnar file of scansion results')
+        length = int.from_bytes(self.__view[len(magic):len(magic) + 8], 'little')
+        start = len(magic) + 8
+        self.header = json.loads(str(self.__view[start:start + length], 'utf-8'))
+        if self.header['byteorder'] != sys.byteorder:
+            raise ValueError(f'{path} was written with {self.header["byteorder"]}-endian byte order')
+        self.sources = self.header['sources']
+        self.__columns = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self.header['rows']
+
+    @property
+    def names(self):
+        """
+        Return the names of the columns.
+
+        :return: A list of names.
+        """
+        return list(self.header['columns'])
+
+    def column(self, name):
+        """
+        Return a column without copying it.
+
+        :param name: The name of the column.
+        :return: A memoryview of the numbers of a numeric column, or a StringColumn.
+        """
+        if name not in self.__columns:
+            info = self.header['columns'][name]
+            if info['type'] == 'strings':
+                offsets = self.__view[info['offsets']:info['offsets'] + (len(self) + 1) * 8].cast('q')
+                self.__columns[name] = StringColumn(offsets, self.__view[info['data']:info['data'] + info['size']])
+            else:
+                self.__columns[name] = self.__view[info['offset']:info['offset'] + info['size']].cast(info['type'])
+        return self.__columns[name]
+
+    def numpy(self, name):
+        """
+        Return a numeric column as a NumPy array sharing the memory of the file.
+
+        :param name: The name of the column.
+        :return: A read-only NumPy array.
+        """
+        import numpy as np
+        return np.frombuffer(self.column(name), dtype=self.header['columns'][name]['type'])
+
+    def source(self, idx):
+        """
+        Return the source of a verse.
+
+        :param idx: The index of the verse.
+        :return: The source.
+        """
+        return self.sources[self.column('source')[idx]]
+
+    def row(self, idx):
+        """
+        Return the results of a verse.
+
+        :param idx: The index of the verse.
+        :return: A dictionary with the source, number and results of the verse, as returned by scan_corpus.
+        """
+        result = {'source': self.source(idx), 'n': self.column('n')[idx], 'line': self.column('line')[idx]}
+        error = self.column('error')[idx]
+        if error:
+            result['error'] = error
+            return result
+        for name in ('syllables', 'count', 'rhythm', 'nuclei', 'asson', 'rhyme',
+                     'ambiguity', 'natural', 'estimate', 'expected_syl'):
+            value = self.column(name)[idx]
+            result[name] = json.loads(value) if name in ('syllables', 'expected_syl') else value
+        return result
+
+    def __iter__(self):
+        return (self.row(idx) for idx in range(len(self)))
+
+    def where(self, name, value):
+        """
+        Find the verses with a value in a column.
+
+        :param name: The name of the column.
+        :param value: The value.
+        :return: A list of indices.
+        """
+        column = self.column(name)
+        if name == 'source':
+            value = self.sources.index(value) if value in self.sources else -1
+        return [idx for idx, item in enumerate(column) if item == value]
+
+    def close(self):
+        """
+        Release the columns and the memory mapping.
+
+        The columns cannot be read once the store is closed. If NumPy arrays
+        of the columns are still referenced, the mapping is released when they
+        are deleted.
+        """
+        for column in self.__columns.values():
+            for view in (column.offsets, column.data) if isinstance(column, StringColumn) else (column,):
+                view.release()
+        self.__columns.clear()
+        self.__view.release()
+        try:
+            self.__map.close()
+        except BufferError:
+            pass
@@ -0,0 +1,152 @@
+"""Scansion of whole corpora with a pool of worker processes."""
+import os
+import sys
+import time
+import multiprocessing
+from .libEscansion import VerseMetre, conf, get_pipeline
+from .annotations import read_conllu
+from .batch import annotate, chunks, chunk_size
+from .tei import iter_tei
+
+
+def read_verses(path):
+    """
+    Read the verses of a corpus file.
+
+    CoNLL-U files (.conllu) are read with their annotations and TEI files (.xml)
+    with the attributes of their <l> elements; any other file is read as plain
+    text with one verse per line.
+
+    :param path: The path of the file.
+    :return: A generator of (source, number, verse, document, attributes) tuples.
+    """
+    if path.endswith('.xml'):
+        yield from iter_tei(path)
+    elif path.endswith('.conllu'):
+        with open(path, encoding='utf-8') as fp:
+            for number, (line, doc) in enumerate(read_conllu(fp), 1):
+                yield path, number, line, doc, {}
+    else:
+        with open(path, encoding='utf-8') as fp:
+            for number, line in enumerate(fp, 1):
+                if line := line.strip():
+                    yield path, number, line, None, {}
+
+
+def scan_verses(verses, expected_syl=False, adso=False):
+    """
+    Scan a list of verses, tagging those without annotations in a single pipeline call.
+
+    Verses that cannot be scanned are reported with the error instead of the results.
+
+    :param verses: A list of (source, number, verse, document, attributes) tuples.
+    :param expected_syl: The list of expected syllable counts, as in VerseMetre.
+    :param adso: Boolean to trigger specific behavior for 'adso' cases.
+    :return: A list of dictionaries with the source, number, attributes and results of each verse.
+    """
+    untagged = [line for _, _, line, doc, _ in verses if doc is None]
+    tagged = iter(annotate(untagged) if untagged else ())
+    results = []
+    for source, number, line, doc, attributes in verses:
+        if doc is None:
+            doc = next(tagged)
+        try:
+            result = VerseMetre(line, expected_syl, adso, doc=doc).to_dict()
+        except Exception as error:
+            result = {'line': line, 'error': f'{type(error).__name__}: {error}'}
+        results.append({'source': source, 'n': number, **result})
+        if attributes:
+            results[-1]['attributes'] = attributes
+    return results
+
+
+def _init_worker(config, load):
+    conf.update(config)
+    if load:
+        get_pipeline()
+    if torch := sys.modules.get('torch'):
+        torch.set_num_threads(1)
+
+
+def _scan_chunk(task):
+    verses, expected_syl, adso = task
+    start = time.perf_counter()
+    results = scan_verses(verses, expected_syl, adso)
+    return os.getpid(), time.perf_counter() - start, results
+
+
+class CorpusScan:
+    """
+    Class to scan the verses of several files with a pool of processes.
+
+    The verses are sent to the workers by chunks and the results are yielded in
+    the order of the files and verses. Each worker loads the pipeline once; if
+    it is preloaded and processes are forked, the model memory is shared.
+    """
+
+    def __init__(self, paths, workers=None, expected_syl=False, adso=False, size=None, preload=True):
+        """
+        Initialize the CorpusScan class.
+
+        :param paths: A list of paths of plain text, CoNLL-U or TEI files.
+        :param workers: The number of worker processes, by default the number of CPUs.
+        :param expected_syl: The list of expected syllable counts, as in VerseMetre.
+        :param adso: Boolean to trigger specific behavior for 'adso' cases.
+        :param size: The number of verses in each chunk.
+        :param preload: Boolean to load the pipeline before forking the workers.
+        """
+        self.paths = list(paths)
+        self.workers = workers or os.cpu_count()
+        self.expected_syl = expected_syl
+        self.adso = adso
+        self.size = size or chunk_size
+        self.preload = preload
+        self.stats = {}
+        self.elapsed = 0
+
+    def __verses(self):
+        for path in self.paths:
+            yield from read_verses(path)
+
+    def __iter__(self):
+        load = any(not path.endswith('.conllu') for path in self.paths)
+        methods = multiprocessing.get_all_start_methods()
+        fork = self.preload and 'fork' in methods
+        if fork and load:
+            get_pipeline()
+        context = multiprocessing.get_context('fork' if fork else None)
+        tasks = ((chunk, self.expected_syl, self.adso) for chunk in chunks(self.__verses(), self.size))
+        start = time.perf_counter()
+        with context.Pool(self.workers, _init_worker, (dict(conf), load and not fork)) as pool:
+            for pid, elapsed, results in pool.imap(_scan_chunk, tasks):
+                worker = self.stats.setdefault(pid, {'verses': 0, 'seconds': 0.0})
+                worker['verses'] += len(results)
+                worker['seconds'] += elapsed
+                self.elapsed = time.perf_counter() - start
+                yield from results
+
+    def throughput(self):
+        """
+        Return the throughput of the scan.
+
+        :return: A dictionary with the verses per second of each worker and of the whole pool.
+        """
+        workers = {pid: stat['verses'] / stat['seconds'] if stat['seconds'] else 0.0
+                   for pid, stat in self.stats.items()}
+        verses = sum(stat['verses'] for stat in self.stats.values())
+        return {'workers': workers, 'total': verses / self.elapsed if self.elapsed else 0.0}
+
+
+def scan_corpus(paths, workers=None, expected_syl=False, adso=False, size=None, preload=True):
+    """
+    Scan the verses of several files with a pool of processes.
+
+    :param paths: A list of paths of plain text, CoNLL-U or TEI files.
+    :param workers: The number of worker processes, by default the number of CPUs.
+    :param expected_syl: The list of expected syllable counts, as in VerseMetre.
+    :param adso: Boolean to trigger specific behavior for 'adso' cases.
+    :param size: The number of verses in each chunk.
+    :param preload: Boolean to load the pipeline before forking the workers.
+    :return: A CorpusScan object, iterable over the results in order.
+    """
+    return CorpusScan(paths, workers, expected_syl, adso, size, preload)
@@ -0,0 +1,231 @@
+"""Incremental scansion of a poem or a play being edited.
+
+Every verse of the document is tagged once and kept with its analysis. When
+lines are inserted, deleted or replaced, only the new lines are tagged, and
+the other verses of the blocks around the edit are scanned again only if the
+metres of their block, which are their hints, have changed:
+
+    >>> document = libEscansion.DocumentScan(lines, [11, 7])
+    >>> document.replace(120, 'Cerrar podrá mis ojos la postrera')
+    >>> document[120].count, document.scheme(120)
+
+Blocks are separated by empty lines, as in scan_poem, so the work of an edit
+depends on the size of its block and not on the size of the document.
+"""
+from dataclasses import dataclass
+from .libEscansion import VerseMetre
+from .batch import annotate, chunks, chunk_size
+from .poem import block_metres, verse_hint, _error
+from .rhymes import rhyme_scheme
+
+
+@dataclass
+class DocumentLine:
+    """A class to represent a line of a document and the analysis of its verse."""
+    text: str
+    verse: VerseMetre = None
+    hint: list = None
+    error: str = None
+
+
+class DocumentScan:
+    """
+    A class to scan a document and keep its scansion up to date as it is edited.
+    """
+
+    def __init__(self, lines=(), expected_syl=False, adso=False, size=None, share=None):
+        """
+        Tag and scan the lines of the document.
+
+        :param lines: An iterable of lines, with empty lines between blocks.
+        :param expected_syl: The list of possible counts, or False for the most common ones.
+        :param adso: Boolean to trigger specific behavior for 'adso' cases.
+        :param size: The number of verses tagged in each pipeline call.
+        :param share: The share of the verses of a block a metre needs, or None for metre_share.
+        """
+        self.candidates = list(expected_syl or VerseMetre.most_common)
+        self.adso = adso
+        self.size = size or chunk_size
+        self.share = share
+        self.lines = []
+        self.scanned = 0
+        self.edit(0, 0, lines)
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __getitem__(self, idx):
+        """
+        Return the scanned verse of a line.
+
+        :param idx: The index of the line.
+        :return: A VerseMetre object, or None if the line is empty or could not be scanned.
+        """
+        line = self.lines[idx]
+        return line.verse if line.error is None else None
+
+    @property
+    def text(self):
+        """
+        Return the lines of the document.
+
+        :return: A list of strings.
+        """
+        return [line.text for line in self.lines]
+
+    def error(self, idx):
+        """
+        Return the error raised by the verse of a line.
+
+        :param idx: The index of the line.
+        :return: A description of the error, or None if there was none.
+        """
+        return self.lines[idx].error
+
+    def edit(self, start, stop, lines):
+        """
+        Replace a range of lines with new ones, and scan the lines affected.
+
+        :param start: The index of the first line replaced.
+        :param stop: The index after the last line replaced; equal to start to insert.
+        :param lines: An iterable of new lines, empty to delete.
+        :return: A list with the indices of the lines scanned.
+        """
+        new = self.__analyse([line or '' for line in lines])
+        self.lines[start:stop] = new
+        first, last = self.__block(start, start + len(new))
+        return self.__refresh(first, last)
+
+    def insert(self, idx, lines):
+        """
+        Insert lines before a line.
+
+        :param idx: The index of the line, or the length of the document to append.
+        :param lines: A line or a list of lines.
+        :return: A list with the indices of the lines scanned.
+        """
+        return self.edit(idx, idx, [lines] if isinstance(lines, str) else lines)
+
+    def delete(self, idx, count=1):
+        """
+        Delete lines.
+
+        :param idx: The index of the first line.
+        :param count: The number of lines.
+        :return: A list with the indices of the lines scanned.
+        """
+        return self.edit(idx, idx + count, [])
+
+    def replace(self, idx, lines):
+        """
+        Replace lines by the same number of new ones.
+
+        :param idx: The index of the first line.
+        :param lines: A line or a list of lines.
+        :return: A list with the indices of the lines scanned.
+        """
+        lines = [lines] if isinstance(lines, str) else list(lines)
+        return self.edit(idx, idx + len(lines), lines)
+
+    def block(self, idx):
+        """
+        Return the range of the block of a line.
+
+        :param idx: The index of the line.
+        :return: A tuple with the index of the first line of the block and the index after its last line;
+                 an empty line is a block of its own.
+        """
+        if not self.lines[idx].text.strip():
+            return idx, idx + 1
+        return self.__block(idx, idx + 1)
+
+    def metres(self, idx):
+        """
+        Return the metres of the block of a line.
+
+        :param idx: The index of the line.
+        :return: The list of metres of the block, the most frequent first.
+        """
+        first, last = self.block(idx)
+        return self.__metres(self.lines[first:last])
+
+    def scheme(self, idx, kind='rhyme'):
+        """
+        Return the rhyme scheme of the block of a line.
+
+        :param idx: The index of the line.
+        :param kind: 'rhyme' for consonant rhymes or 'asson' for assonances.
+        :return: A list of labels, one for each line of the block, as in RhymeIndex.scheme.
+        """
+        first, last = self.block(idx)
+        return rhyme_scheme([getattr(self[position], kind) or '' if self[position] else ''
+                             for position in range(first, last)])
+
+    def __analyse(self, texts):
+        """
+        Tag new lines and analyse their verses, without scanning them.
+
+        :param texts: A list of lines.
+        :return: A list of DocumentLine objects.
+        """
+        lines = [DocumentLine(text) for text in texts]
+        verses = [line for line in lines if line.text.strip()]
+        for chunk in chunks(verses, self.size):
+            for line, doc in zip(chunk, annotate([line.text for line in chunk])):
+                try:
+                    line.verse = VerseMetre(line.text, self.candidates, self.adso, doc=doc, deferred=True)
+                except Exception as error:
+                    line.error = _error(error)
+        return lines
+
+    def __block(self, start, stop):
+        """
+        Extend a range of lines to the whole blocks around it.
+
+        :param start: The index of the first line.
+        :param stop: The index after the last line.
+        :return: A tuple with the index of the first line and the index after the last line of the blocks.
+        """
+        lines = self.lines
+        while start > 0 and lines[start - 1].text.strip():
+            start -= 1
+        while stop < len(lines) and lines[stop].text.strip():
+            stop += 1
+        return start, stop
+
+    def __metres(self, lines):
+        return block_metres([line.verse.estimate for line in lines if line.verse is not None],
+                            self.candidates, self.share)
+
+    def __refresh(self, first, last):
+        """
+        Scan the verses of some blocks whose hints have changed.
+
+        :param first: The index of the first line of the blocks.
+        :param last: The index after the last line of the blocks.
+        :return: A list with the indices of the lines scanned.
+        """
+        scanned = []
+        idx = first
+        while idx < last:
+            if not self.lines[idx].text.strip():
+                idx += 1
+                continue
+            start, stop = self.__block(idx, idx + 1)
+            block = self.lines[start:stop]
+            metres = self.__metres(block)
+            for position, line in enumerate(block, start):
+                if line.verse is None:
+                    continue
+                hint = verse_hint(line.verse.estimate, metres, self.candidates)
+                if hint == line.hint:
+                    continue
+                line.hint, line.error = hint, None
+                try:
+                    line.verse.scan(hint)
+                except Exception as error:
+                    line.error = _error(error)
+                scanned.append(position)
+            idx = stop
+        self.scanned += len(scanned)
+        return scanned
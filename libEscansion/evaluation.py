@@ -0,0 +1,226 @@
+"""Evaluation of the scansion against annotated corpora.
+
+The verses of TEI files are scanned, in parallel if several workers are
+given, and their counts and rhythms compared with the metre annotated in the
+attributes of their <l> elements. The report can be saved and compared with a
+previous one, failing if the accuracy or the speed regress:
+
+    python -m libEscansion.evaluation corpus/*.xml --workers 4 --save report.json
+    python -m libEscansion.evaluation corpus/*.xml --baseline report.json --min-accuracy 0.95
+"""
+import sys
+import json
+import time
+import argparse
+from .libEscansion import version
+from .batch import chunks, chunk_size
+from .corpus import CorpusScan, read_verses, scan_verses
+from .tei import rhythm_matches
+
+# Attributes holding the annotated metre, in order of preference
+gold_attributes = ('real', 'met')
+
+
+def gold_metre(attributes, names=gold_attributes):
+    """
+    Read the annotated metre of a verse.
+
+    The metre is either a rhythm of '+' and '-', possibly split into
+    hemistichs, or a number of syllables.
+
+    :param attributes: The attributes of the <l> element.
+    :param names: The attributes holding the metre, in order of preference.
+    :return: A tuple with the count and the rhythm, which is None if only the count is annotated,
+             or None if the verse is not annotated.
+    """
+    for name in names:
+        value = (attributes.get(name) or '').strip()
+        if value.isdigit():
+            return int(value), None
+        rhythm = ''.join(char for char in value if char in '+-')
+        if rhythm:
+            return len(rhythm), rhythm
+    return None
+
+
+class Evaluation:
+    """
+    A class to accumulate the comparison of scansion results with their annotations.
+    """
+
+    def __init__(self, names=gold_attributes):
+        """
+        Initialize the Evaluation class.
+
+        :param names: The attributes holding the metre, in order of preference.
+        """
+        self.names = names
+        self.verses = self.annotated = self.errors = 0
+        self.by_metre, self.by_play, self.confusion = {}, {}, {}
+
+    def add(self, result):
+        """
+        Compare the result of a verse with its annotation.
+
+        :param result: A dictionary as returned by scan_verses or scan_corpus.
+        :return: A tuple with the booleans of the count and rhythm matching, or None if the verse is not annotated.
+        """
+        self.verses += 1
+        gold = gold_metre(result.get('attributes', {}), self.names)
+        if gold is None:
+            return None
+        self.annotated += 1
+        count, rhythm = gold
+        if 'error' in result:
+            self.errors += 1
+            found, matches = 'error', (False, False if rhythm else None)
+        else:
+            found = str(result['count'])
+            matches = (result['count'] == count, rhythm_matches(result['rhythm'], rhythm) if rhythm else None)
+        row = self.confusion.setdefault(str(count), {})
+        row[found] = row.get(found, 0) + 1
+        for groups, key in ((self.by_metre, str(count)), (self.by_play, result.get('source', ''))):
+            group = groups.setdefault(key, {'verses': 0, 'count': 0, 'rhythm': 0, 'rhythms': 0})
+            group['verses'] += 1
+            group['count'] += matches[0]
+            if matches[1] is not None:
+                group['rhythms'] += 1
+                group['rhythm'] += matches[1]
+        return matches
+
+    @staticmethod
+    def __accuracy(group):
+        return {'verses': group['verses'],
+                'count': group['count'] / group['verses'] if group['verses'] else None,
+                'rhythm': group['rhythm'] / group['rhythms'] if group['rhythms'] else None}
+
+    def report(self):
+        """
+        Return the accuracy of the results added so far.
+
+        :return: A dictionary with the overall accuracy, the accuracy by metre and by play, and the confusion
+                 matrix of the annotated counts (rows) and the counts found (columns).
+        """
+        total = {'verses': 0, 'count': 0, 'rhythm': 0, 'rhythms': 0}
+        for group in self.by_metre.values():
+            for key in total:
+                total[key] += group[key]
+        return {
+            'verses': self.verses,
+            'annotated': self.annotated,
+            'errors': self.errors,
+            'accuracy': self.__accuracy(total),
+            'by_metre': {metre: self.__accuracy(group)
+                         for metre, group in sorted(self.by_metre.items(), key=lambda item: int(item[0]))},
+            'by_play': {play: self.__accuracy(group) for play, group in self.by_play.items()},
+            'confusion': {metre: dict(sorted(row.items(), key=lambda item: (item[0] == 'error', item[0].zfill(3))))
+                          for metre, row in sorted(self.confusion.items(), key=lambda item: int(item[0]))},
+        }
+
+
+def run(paths, workers=1, expected_syl=False, adso=False, size=None, names=gold_attributes):
+    """
+    Scan annotated files and evaluate the results.
+
+    :param paths: A list of paths of TEI files.
+    :param workers: The number of worker processes; with 1 the verses are scanned in this process.
+    :param expected_syl: The list of expected syllable counts, as in VerseMetre.
+    :param adso: Boolean to trigger specific behavior for 'adso' cases.
+    :param size: The number of verses in each chunk.
+    :param names: The attributes holding the metre, in order of preference.
+    :return: A dictionary with the report.
+    """
+    evaluation = Evaluation(names)
+    start = time.perf_counter()
+    if workers > 1:
+        results = CorpusScan(paths, workers, expected_syl, adso, size)
+    else:
+        verses = (verse for path in paths for verse in read_verses(path))
+        results = (result for chunk in chunks(verses, size or chunk_size)
+                   for result in scan_verses(chunk, expected_syl, adso))
+    for result in results:
+        evaluation.add(result)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'version': version,
+        **evaluation.report(),
+        'workers': workers,
+        'seconds': elapsed,
+        'verses_per_second': evaluation.verses / elapsed if elapsed else 0.0,
+    }
+
+
+def compare(report, baseline, tolerance=0.005, threshold=0.1):
+    """
+    Compare a report with a baseline.
+
+    :param report: The current report.
+    :param baseline: A previous report of the same corpus.
+    :param tolerance: The loss of accuracy tolerated, e.g. 0.005 for half a point.
+    :param threshold: The relative loss of speed tolerated, e.g. 0.1 for 10 %.
+    :return: A list of descriptions of the regressions found.
+    """
+    regressions = []
+    groups = [('overall', report['accuracy'], baseline['accuracy'])]
+    groups += [(f'{metre} syllables', accuracy, baseline['by_metre'][metre])
+               for metre, accuracy in report['by_metre'].items() if metre in baseline['by_metre']]
+    for name, accuracy, old in groups:
+        for measure in ('count', 'rhythm'):
+            if accuracy[measure] is not None and old[measure] is not None and \
+                    accuracy[measure] < old[measure] - tolerance:
+                regressions.append(f'{name} {measure} accuracy: {old[measure]:.2%} -> {accuracy[measure]:.2%}')
+    old, new = baseline['verses_per_second'], report['verses_per_second']
+    if new < old * (1 - threshold):
+        regressions.append(f'verses/s: {old:.1f} -> {new:.1f}')
+    return regressions
+
+
+def _percent(value):
+    return '    -' if value is None else f'{value:6.1%}'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m libEscansion.evaluation',
+                                     description='Evaluation of the scansion against annotated TEI files.')
+    parser.add_argument('files', nargs='+', help='TEI files with the metre of the verses annotated')
+    parser.add_argument('-e', '--expected', type=int, nargs='+', default=False,
+                        help='expected syllable counts, in order of preference')
+    parser.add_argument('-a', '--adso', action='store_true', help='unstressed interjections, as in ADSO')
+    parser.add_argument('-g', '--gold', nargs='+', default=gold_attributes,
+                        help='attributes holding the metre, in order of preference')
+    parser.add_argument('-w', '--workers', type=int, default=1, help='number of worker processes')
+    parser.add_argument('-s', '--size', type=int, default=chunk_size, help='verses in each chunk')
+    parser.add_argument('-o', '--save', help='file to save the report to')
+    parser.add_argument('-b', '--baseline', help='report to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.005, help='loss of accuracy tolerated')
+    parser.add_argument('-t', '--threshold', type=float, default=0.1, help='relative loss of speed tolerated')
+    parser.add_argument('--min-accuracy', type=float, help='minimum count accuracy required')
+    args = parser.parse_args(argv)
+
+    report = run(args.files, args.workers, args.expected, args.adso, args.size, tuple(args.gold))
+    accuracy = report['accuracy']
+    print(f"{report['annotated']} of {report['verses']} verses annotated, {report['errors']} errors, "
+          f"{report['verses_per_second']:.1f} verses/s")
+    print(f"{'':24} {'verses':>7} {'count':>7} {'rhythm':>7}")
+    print(f"{'overall':24} {accuracy['verses']:7} {_percent(accuracy['count']):>7} {_percent(accuracy['rhythm']):>7}")
+    for groups in ('by_metre', 'by_play'):
+        for name, group in report[groups].items():
+            print(f"{name[-24:]:24} {group['verses']:7} {_percent(group['count']):>7} {_percent(group['rhythm']):>7}")
+    if args.save:
+        with open(args.save, 'w') as fp:
+            json.dump(report, fp, indent=2, ensure_ascii=False)
+
+    regressions = []
+    if args.min_accuracy is not None and (accuracy['count'] or 0) < args.min_accuracy:
+        regressions.append(f"count accuracy {accuracy['count'] or 0:.2%} below {args.min_accuracy:.2%}")
+    if args.baseline:
+        with open(args.baseline) as fp:
+            regressions += compare(report, json.load(fp), args.tolerance, args.threshold)
+    for regression in regressions:
+        print(f'Regression: {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""Opt-in instrumentation of the scansion.
+
+When enabled, each VerseMetre object gets a VerseMetrics object in its
+'metrics' attribute with the wall time of every stage and the counters of the
+hot paths, and the totals of all the verses scanned are aggregated here, those
+that could not be scanned included. When disabled, 'metrics' is None and
+nothing is measured.
+"""
+from threading import Lock
+from time import perf_counter
+
+enabled = False
+totals = {'verses': 0, 'failed': 0, 'seconds': {}, 'counts': {}, 'max': {}}
+_lock = Lock()
+
+
+class VerseMetrics:
+    """A class to represent the measures taken while scanning a verse."""
+    __slots__ = ('seconds', 'counts', '__seen')
+
+    def __init__(self):
+        self.seconds = {}
+        self.counts = {}
+        self.__seen = {}
+
+    def time(self, stage, start):
+        """
+        Add the time elapsed since start to a stage.
+
+        :param stage: The name of the stage.
+        :param start: The value of perf_counter when the stage started.
+        """
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + perf_counter() - start
+
+    def count(self, counter, value=1):
+        """
+        Increase a counter.
+
+        :param counter: The name of the counter.
+        :param value: The amount added.
+        """
+        self.counts[counter] = self.counts.get(counter, 0) + value
+
+    def distinct(self, counter, value):
+        """
+        Increase a counter the first time a value is seen.
+
+        :param counter: The name of the counter.
+        :param value: The value seen.
+        """
+        seen = self.__seen.setdefault(counter, set())
+        if value not in seen:
+            seen.add(value)
+            self.count(counter)
+
+    def to_dict(self):
+        """
+        Return the measures.
+
+        :return: A dictionary with the seconds per stage and the counters.
+        """
+        return {'seconds': dict(self.seconds), 'counts': dict(self.counts)}
+
+
+def enable():
+    """Start measuring the verses scanned from now on."""
+    global enabled
+    enabled = True
+
+
+def disable():
+    """Stop measuring."""
+    global enabled
+    enabled = False
+
+
+def reset():
+    """Discard the totals aggregated so far."""
+    with _lock:
+        totals['verses'] = totals['failed'] = 0
+        totals['seconds'] = {}
+        totals['counts'] = {}
+        totals['max'] = {}
+
+
+def record(metrics, failed=False):
+    """
+    Add the measures of a verse to the totals.
+
+    Both the sum and the maximum per verse of each counter are kept.
+
+    :param metrics: A VerseMetrics object.
+    :param failed: Boolean, True if the verse raised an exception while it was scanned.
+    """
+    with _lock:
+        totals['verses'] += 1
+        totals['failed'] += failed
+        for stage, seconds in metrics.seconds.items():
+            totals['seconds'][stage] = totals['seconds'].get(stage, 0.0) + seconds
+        for counter, value in metrics.counts.items():
+            totals['counts'][counter] = totals['counts'].get(counter, 0) + value
+            totals['max'][counter] = max(totals['max'].get(counter, 0), value)
+
+
+def summary():
+    """
+    Return a copy of the totals.
+
+    :return: A dictionary with the number of verses, of those that failed, the seconds per stage, and the sum and
+             maximum of the counters.
+    """
+    with _lock:
+        return {'verses': totals['verses'], 'failed': totals['failed'], 'seconds': dict(totals['seconds']),
+                'counts': dict(totals['counts']), 'max': dict(totals['max'])}
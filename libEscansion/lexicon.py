@@ -0,0 +1,225 @@
+"""Lexicon-backed tagging of verses, falling back to Stanza for unknown words.
+
+A lexicon maps every token to the words, POS tags and features Stanza gave it
+in earlier runs. Tokens that always received the same analysis are tagged from
+the lexicon; verses with unknown or ambiguous tokens are tagged by Stanza. The
+lexicon is built from CoNLL-U files written by export_conllu:
+
+    python -m libEscansion.lexicon play1.conllu play2.conllu --output lexicon.json
+"""
+import re
+import sys
+import json
+import argparse
+from collections import Counter
+from .libEscansion import build_pipeline
+from .annotations import Token, Word, Sentence, Document, read_conllu
+
+# Features read by the prosodic stress rules
+features = ('Case', 'Definite', 'Poss', 'PronType')
+
+
+def reduce_feats(feats):
+    """
+    Keep only the features read by the scansion.
+
+    :param feats: A features string, as in CoNLL-U, or None.
+    :return: The reduced features string, or None if none is left.
+    """
+    if not feats:
+        return None
+    kept = [element for element in feats.split('|') if element.split('=')[0] in features]
+    return '|'.join(kept) or None
+
+
+def analysis(token):
+    """
+    Return the analysis of a tagged token.
+
+    :param token: A token from a Stanza document or from annotations.Document.
+    :return: A tuple of (text, upos, feats) tuples, one for each word of the token.
+    """
+    return tuple((word.text, word.upos, reduce_feats(word.feats)) for word in token.words)
+
+
+class Lexicon:
+    """
+    A class to represent a lexicon of tokens and their unambiguous analyses.
+    """
+
+    def __init__(self, entries=None, ambiguous=None):
+        """
+        Initialize the Lexicon class.
+
+        :param entries: A dictionary mapping tokens to their analysis.
+        :param ambiguous: A set of tokens with more than one analysis.
+        """
+        self.entries = entries or {}
+        self.ambiguous = ambiguous or set()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, token):
+        return token in self.entries
+
+    def lookup(self, token):
+        """
+        Return the analysis of a token.
+
+        :param token: The text of the token.
+        :return: A tuple of (text, upos, feats) tuples, or None if the token is unknown or ambiguous.
+        """
+        return self.entries.get(token)
+
+    @classmethod
+    def build(cls, documents, min_count=1, min_share=1.0):
+        """
+        Build a lexicon from tagged documents.
+
+        :param documents: An iterable of tagged documents, from Stanza or annotations.
+        :param min_count: The times a token must have been seen to be kept.
+        :param min_share: The share of its occurrences its most frequent analysis must have.
+        :return: A Lexicon object.
+        """
+        counts = {}
+        for doc in documents:
+            for sentence in doc.sentences if doc is not None else []:
+                for token in sentence.tokens:
+                    counts.setdefault(token.text, Counter())[analysis(token)] += 1
+
+        entries, ambiguous = {}, set()
+        for token, analyses in counts.items():
+            (best, count), total = analyses.most_common(1)[0], sum(analyses.values())
+            if count / total < min_share:
+                ambiguous.add(token)
+            elif total >= min_count:
+                entries[token] = best
+        return cls(entries, ambiguous)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a lexicon saved with save.
+
+        :param path: The path of the JSON file.
+        :return: A Lexicon object.
+        """
+        with open(path, encoding='utf-8') as fp:
+            data = json.load(fp)
+        entries = {token: tuple(tuple(word) for word in words) for token, words in data['entries'].items()}
+        return cls(entries, set(data['ambiguous']))
+
+    def save(self, path):
+        """
+        Save the lexicon as JSON.
+
+        :param path: The path of the JSON file.
+        """
+        with open(path, 'w', encoding='utf-8') as fp:
+            json.dump({'entries': self.entries, 'ambiguous': sorted(self.ambiguous)}, fp, ensure_ascii=False)
+
+
+class LexiconTagger:
+    """
+    A pipeline tagging verses from a lexicon, and with Stanza those it cannot.
+
+    It is called as a Stanza pipeline, with a text or a list of documents, so
+    it can be set with set_pipeline. The Stanza pipeline is built only if a
+    verse has to be tagged by it.
+    """
+
+    def __init__(self, lexicon, fallback=None):
+        """
+        Initialize the LexiconTagger class.
+
+        :param lexicon: A Lexicon object, or the path of a saved lexicon.
+        :param fallback: The pipeline for the verses not covered, or None for Stanza.
+        """
+        self.lexicon = Lexicon.load(lexicon) if isinstance(lexicon, str) else lexicon
+        self.fallback = fallback
+        self.lines = self.unknown = self.ambiguous = 0
+
+    def __call__(self, doc):
+        if isinstance(doc, str):
+            return self.tag(doc) or self.__fallback()(doc)
+        tagged = [self.tag(item.text) for item in doc]
+        missing = [item for item, result in zip(doc, tagged) if result is None]
+        if missing:
+            fallback = iter(self.__fallback()(missing))
+            tagged = [result if result is not None else next(fallback) for result in tagged]
+        return tagged
+
+    def __fallback(self):
+        if self.fallback is None:
+            self.fallback = build_pipeline()
+        return self.fallback
+
+    def tag(self, text):
+        """
+        Tag a verse from the lexicon.
+
+        :param text: The verse, as prepared by prepare_line.
+        :return: An annotations.Document, or None if a token is unknown or ambiguous.
+        """
+        self.lines += 1
+        sentences, tokens, words = [], [], 0
+        for form in re.findall(r'\w+|[^\w\s]', text):
+            entry = self.lexicon.lookup(form)
+            if entry is None:
+                if form in self.lexicon.ambiguous:
+                    self.ambiguous += 1
+                else:
+                    self.unknown += 1
+                return None
+            token = Token((words + 1, words + len(entry)) if len(entry) > 1 else (words + 1,), form)
+            for word, upos, feats in entry:
+                words += 1
+                token.words.append(Word(words, word, upos=upos, feats=feats, parent=token))
+            tokens.append(token)
+            if form == '.':
+                sentences.append(Sentence(tokens))
+                tokens, words = [], 0
+        if tokens:
+            sentences.append(Sentence(tokens))
+        return Document(sentences, text=text)
+
+    def stats(self):
+        """
+        Return the counts of the verses tagged and of those left to the fallback.
+
+        :return: A dictionary with the verses, the fallbacks by cause and the fallback rate.
+        """
+        fallbacks = self.unknown + self.ambiguous
+        return {'lines': self.lines, 'unknown': self.unknown, 'ambiguous': self.ambiguous,
+                'fallback_rate': fallbacks / self.lines if self.lines else 0.0}
+
+    def reset(self):
+        """Reset the counts."""
+        self.lines = self.unknown = self.ambiguous = 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m libEscansion.lexicon',
+                                     description='Build a lexicon from verses tagged in CoNLL-U format.')
+    parser.add_argument('files', nargs='+', help='CoNLL-U files written by export_conllu')
+    parser.add_argument('-o', '--output', required=True, help='file to save the lexicon to')
+    parser.add_argument('-c', '--min-count', type=int, default=1, help='times a token must have been seen')
+    parser.add_argument('-s', '--min-share', type=float, default=1.0,
+                        help='share of the occurrences of a token its analysis must have')
+    args = parser.parse_args(argv)
+
+    def documents():
+        for path in args.files:
+            with open(path, encoding='utf-8') as fp:
+                for line, doc in read_conllu(fp):
+                    yield doc
+
+    lexicon = Lexicon.build(documents(), args.min_count, args.min_share)
+    lexicon.save(args.output)
+    print(f'{len(lexicon)} tokens, {len(lexicon.ambiguous)} ambiguous')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
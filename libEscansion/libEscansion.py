@@ -1,26 +1,102 @@
 import re
-import stanza
 from math import sqrt
 from fonemas import Transcription
+from time import perf_counter
 from dataclasses import dataclass
+from collections import namedtuple
+from functools import lru_cache
+from itertools import combinations, islice
+from threading import Lock
+from .cache import LRUCache
+from .annotations import Word
+from . import instrumentation
 
 # Version information
 version = '1.1.0'  # 2/09/2024
 
 # Stanza NLP Pipeline Configuration
+# Only the processors the scansion reads are loaded by default: tokens and
+# multi-word tokens for the word grouping, and POS tags and features for the
+# prosodic stress rules.
 processor_dict = {
     'tokenize': 'ancora',
     'mwt': 'ancora',
-    'pos': 'ancora',
-    'ner': 'ancora',
-    'depparse': 'ancora'
+    'pos': 'ancora'
 }
 conf = {
     'lang': 'es',
     'processors': processor_dict,
     'download_method': 'None'
 }
-nlp = stanza.Pipeline(**conf, logging_level='ERROR')
+_pipeline = None
+_pipeline_lock = Lock()
+
+
+def configure(processors=None, pretokenized=None, model_dir=None, **kwargs):
+    """
+    Configure the Stanza pipeline used to tag the verses.
+
+    The pipeline is not built here but on its first use, so the configuration
+    must be set before scanning. Changing it discards any pipeline already built.
+
+    :param processors: A list of processor names or a dictionary of processors and packages.
+    :param pretokenized: Boolean to treat the input as whitespace-separated tokens.
+    :param model_dir: The directory containing the Stanza models.
+    :param kwargs: Further keyword arguments passed to stanza.Pipeline.
+    """
+    global _pipeline
+    if processors is not None:
+        if not isinstance(processors, dict):
+            processors = {processor: 'ancora' for processor in processors}
+        conf['processors'] = processors
+    if pretokenized is not None:
+        conf['tokenize_pretokenized'] = pretokenized
+    if model_dir is not None:
+        conf['dir'] = model_dir
+    conf.update(kwargs)
+    _pipeline = None
+
+
+def build_pipeline():
+    """
+    Build a new Stanza pipeline with the current configuration.
+
+    :return: A stanza.Pipeline.
+    """
+    import stanza
+    return stanza.Pipeline(**conf, logging_level='ERROR')
+
+
+def get_pipeline():
+    """
+    Return the Stanza pipeline, building it on first use.
+
+    :return: The configured stanza.Pipeline.
+    """
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = build_pipeline()
+    return _pipeline
+
+
+def set_pipeline(pipeline):
+    """
+    Replace the pipeline used to tag the verses.
+
+    :param pipeline: A stanza.Pipeline or any callable returning a compatible document.
+    """
+    global _pipeline
+    _pipeline = pipeline
+
+
+def __getattr__(name):
+    # Backwards compatibility: `nlp` used to be built at import time.
+    if name == 'nlp':
+        return get_pipeline()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Predefined phonetic values and settings
 usuals = ('xueθ', 'suab', 'kɾuel', 'fiel', 'ruina', 'diabl', 'dios', 'kae',
@@ -37,6 +113,10 @@ trapez = {'i': (-1, 1), 'e': (-1, 0), 'a': (0, -1), 'u': (1, 1),
           'j': (-1, 1), 'ĕ': (-1, 0), 'ă': (0, -1), 'w': (1, 1),
           'y': (-1, 1), 'o': (1, 0), 'ŏ': (1, 0)}
 
+# Distances between the vowels on the trapezium, by (onset, coda)
+distances = {(onset, coda): sqrt((trapez[onset][0] - trapez[coda][0]) ** 2 + (trapez[onset][1] - trapez[coda][1]) ** 2)
+             for onset in trapez for coda in trapez}
+
 non_syllabic = {'a': 'ă', 'e': 'ĕ', 'i': 'j', 'o': 'ŏ', 'u': 'w',
                 'A': 'ă', 'E': 'ĕ', 'I': 'j', 'O': 'ŏ', 'U': 'w',
                 'j': 'j', 'w': 'w', 'ă': 'ă', 'ĕ': 'ĕ', 'ŏ': 'ŏ',
@@ -51,6 +131,63 @@ vowels = close + med
 vocalic = glides + close + med
 allvoc = vocalic + 'ʰ'
 
+
+def prepare_line(transcription):
+    """
+    Clean up the symbols of a raw line before it is tagged.
+
+    :param transcription: The raw input line.
+    :return: The cleaned line.
+    """
+    # Preprocessing substitutions
+    transcription = re.sub(r'[Pp]ara\,', 'Ppara,', transcription)
+    symbols = {
+        '(': '.', ')': '.', '—': '.', '…': '.', '‘': ' ', '’': ' ',
+        ';': '.', ':': '.', '?': '.', '!': '.', '"': ' ', '-': ' ',
+        'õ': 'o', 'æ': 'ae', 'à': 'a', 'è': 'e', 'ì': 'i', 'ò': 'o',
+        'ù': 'u', '«': ' ', '»': ' ', '–': '.', '“': ' ', '”': ' ',
+        "'": ' ', '.': '. '
+    }
+
+    for symbol, replacement in symbols.items():
+        transcription = transcription.replace(symbol, f'{replacement} ')
+    transcription = re.sub(r'\s*\.+(\w)', r',\1', transcription)
+    transcription = re.sub(r'\s*\,+(\w)', r',\1', transcription)
+    transcription = re.sub(r'\[|\]|¿|¡|^\s*[\.\,]', '', transcription)
+    transcription = re.sub(r'\s*\.[\.\s]+', ', ', transcription)
+    return transcription.strip()
+
+
+# Phonological transcriptions by (word, exceptions)
+transcriptions = LRUCache(maxsize=20000)
+# Synaloepha preferences by (onset, coda, preference) and merged syllables by (onset, coda)
+junction_scores = LRUCache(maxsize=65536)
+junction_merges = LRUCache(maxsize=16384)
+
+
+def syllabify(text, exceptions=1, metrics=None):
+    """
+    Return the phonological syllables of a word, transcribing it only once.
+
+    The syllables are cached and a new list is returned on every call, since
+    the scansion modifies them in place.
+
+    :param text: The word.
+    :param exceptions: The exceptions mode passed to fonemas.
+    :param metrics: An optional VerseMetrics object counting the calls to fonemas.
+    :return: A list of syllables with the stress marked.
+    """
+    key = (text, exceptions)
+    syllables = transcriptions.get(key)
+    if syllables is None:
+        if metrics is not None:
+            metrics.count('fonemas_calls')
+        transcription = Transcription(text, mono=True, epenthesis=True, aspiration=True, stress='ˈ', exceptions=exceptions)
+        syllables = tuple(transcription.phonology.syllables)
+        transcriptions.put(key, syllables)
+    return list(syllables)
+
+
 @dataclass
 class Features:
     """A class to represent linguistic features of a word."""
@@ -70,64 +207,275 @@ class VerseFeatures:
     asson: str
     cons: str
 
+@dataclass
+class Resolution(VerseFeatures):
+    """A class to represent the resolution of a verse for an expected syllable count."""
+    hiatus: bool
+    merges: int = 0
+    contracted: int = None
+
+@dataclass
+class Junctions:
+    """A class to represent the candidate synaloephas at the junctions of the syllables of a verse."""
+    words: list
+    between: list
+    within: list
+    verse: 'SyllableArray'
+
+@dataclass
+class MetreSearch:
+    """A class to represent the synaloephas and hiatuses that can adjust the metre of a verse."""
+    syllables: list
+    synaloephas: list
+    hiatuses: list
+    preference: list
+    length: int
+    merged: list
+    split: list
+    resolutions: dict
+    applied: list
+
+@dataclass
+class Alternative:
+    """A class to represent an alternative scansion of a verse, with the choices it makes."""
+    count: int
+    syllables: list
+    rhythm: str
+    nuclei: str
+    asson: str
+    rhyme: str
+    ambiguity: int
+    synaloephas: list
+    hiatuses: list
+    contracted: int
+    score: float
+
+class Syllable:
+    """
+    A class to represent a phonological syllable parsed into its constituents.
+
+    Syllables are immutable and interned by parse_syllable, so that every
+    distinct syllable is parsed only once and shared by all the stages.
+    """
+    __slots__ = ('text', 'onset', 'nucleus', 'coda', 'stress', 'stressed', 'tonic', 'lower',
+                 'vocalic', 'vowels', 'glide', 'rising', 'diphthong', 'hiatus',
+                 'bare', 'initial', 'final', 'opens', 'closes', 'vowel_initial', 'gliding', 'opening', 'closing')
+
+    def __init__(self, text):
+        """
+        Parse the syllable.
+
+        :param text: The syllable, with its stressed vowels in upper case.
+        """
+        nucleus = [idx for idx, char in enumerate(text) if char in vocalic]
+        start, end = (nucleus[0], nucleus[-1] + 1) if nucleus else (len(text), len(text))
+        self.text = text
+        self.onset, self.nucleus, self.coda = text[:start], text[start:end], text[end:]
+        self.stress = next((idx for idx, char in enumerate(text) if char.isupper()), None)
+        self.stressed = self.stress is not None
+        self.tonic = any(x in text for x in 'AEIOU')
+        self.lower = text.islower()
+        self.vocalic = ''.join([x for x in text if x in allvoc])
+        self.vowels = ''.join([x for x in text.lower() if x in vowels])
+
+        glide = re.search(r'([wj][AEOIaeoi])|([AEOIaeoi][wj])', text)
+        self.glide = glide is not None
+        self.rising = bool(glide and glide.group(1) and not glide.group(1).islower())
+
+        diphthong = re.search(r'([jw]*)([aeiouAEIOUjw])([jw]*)', text)
+        self.diphthong = diphthong.group() if diphthong else None
+        self.hiatus = self.__split(text, diphthong) if diphthong and len(diphthong.group()) > 1 else None
+
+        # Vowel classes of the edges of the syllable, as met by the synaloephas
+        self.bare = text.replace('ʰ', '')
+        self.initial, self.final = self.bare[:1], text[-1:]
+        self.opens = text[:1].lower() in allvoc
+        self.closes = self.final.lower() in allvoc
+        self.vowel_initial = self.initial.lower() in allvoc
+        self.gliding = self.bare[1:2] in tuple(glides)
+        first, last = values.get(self.initial), values.get(self.final)
+        self.opening = (first, values.get(self.bare[1], first) if len(self.bare) > 1 else first)
+        self.closing = (values.get(text[-2], last) if len(text) > 1 else last, last)
+
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError(f'{type(self).__name__} is immutable')
+        super().__setattr__(name, value)
+
+    def __repr__(self):
+        return f'Syllable({self.text!r})'
+
+    @staticmethod
+    def __split(text, diphthong):
+        """
+        Split the diphthong of the syllable into two syllables.
+
+        :param text: The syllable.
+        :param diphthong: The match of the diphthong in the syllable.
+        :return: The two syllables separated by a space.
+        """
+        sem2voc = {'j': 'i', 'w': 'u', 'J': 'I', 'W': 'U'}
+        onset = text.split(diphthong.group())[0]
+        coda = text.split(diphthong.group())[1]
+        semiconsonant = diphthong.group(1)
+        nucleus = diphthong.group(2)
+        semivowel = diphthong.group(3)
+
+        if semivowel and nucleus:
+            if nucleus.isupper():
+                nucleus, semivowel = nucleus.lower(), semivowel.upper()
+            first = onset + nucleus
+            second = semivowel.replace(semivowel[-1], sem2voc[semivowel[-1]]) + coda
+        else:
+            first = onset + semiconsonant.replace(semiconsonant[-1], sem2voc[semiconsonant[-1]])
+            second = nucleus + coda
+
+        return f'{first} {second}'
+
+
+@lru_cache(maxsize=65536)
+def parse_syllable(text):
+    """
+    Return the parsed syllable, parsing it only once.
+
+    :param text: The syllable.
+    :return: A Syllable object.
+    """
+    return Syllable(text)
+
+
+def clear_caches():
+    """
+    Empty every cache of the scansion and reset their statistics.
+
+    The transcriptions, the parsed syllables and the synaloephas scored and
+    merged are computed again on their next use.
+    """
+    transcriptions.clear()
+    junction_scores.clear()
+    junction_merges.clear()
+    parse_syllable.cache_clear()
+
+
+class SyllableArray:
+    """
+    A class to represent the syllables of a verse as a flat array, with the word boundaries kept as offsets.
+    """
+    __slots__ = ('texts', 'syllables', 'offsets')
+
+    def __init__(self, words):
+        """
+        Parse the syllables of the words of a verse.
+
+        :param words: The list of words in the verse, each a list of syllables.
+        """
+        self.texts = words
+        self.syllables = [parse_syllable(syllable) for word in words for syllable in word]
+        self.offsets = [0]
+        for word in words:
+            self.offsets.append(self.offsets[-1] + len(word))
+
+    def __len__(self):
+        return len(self.syllables)
+
+    def replace(self, words, start, stop):
+        """
+        Return the array of the words of the verse after some of them have changed, parsing only the new ones.
+
+        :param words: The new list of words.
+        :param start: The index of the first word replaced.
+        :param stop: The index after the last word replaced in this array.
+        :return: A SyllableArray object.
+        """
+        end = len(words) - len(self.texts) + stop
+        array = SyllableArray(words[start:end])
+        shift = self.offsets[start] + array.offsets[-1] - self.offsets[stop]
+        array.texts = words
+        array.syllables = self.syllables[:self.offsets[start]] + array.syllables + self.syllables[self.offsets[stop]:]
+        array.offsets = self.offsets[:start] + [self.offsets[start] + offset for offset in array.offsets[:-1]] + \
+            [offset + shift for offset in self.offsets[stop:]]
+        return array
+
+    def word(self, idx):
+        """
+        Return the parsed syllables of a word.
+
+        :param idx: The index of the word.
+        :return: A list of Syllable objects.
+        """
+        return self.syllables[self.offsets[idx]:self.offsets[idx + 1]]
+
+    def words(self):
+        """
+        Iterate over the parsed syllables of every word.
+
+        :return: An iterator of lists of Syllable objects.
+        """
+        return (self.word(idx) for idx in range(len(self.offsets) - 1))
+
 class PlayLine:
     """
     Class for processing and analyzing a line of verse to extract linguistic and phonological features.
     """
 
-    def __init__(self, line, adso=False):
+    def __init__(self, line, adso=False, doc=None):
         """
         Initialize the PlayLine class.
 
         :param line: The line of verse to be processed.
         :param adso: Boolean to trigger specific behavior for 'adso' cases.
+        :param doc: An optional document already tagged for the line, as returned by the pipeline.
         """
         self.line = line
         self.adso = adso
+        self.metrics = instrumentation.VerseMetrics() if instrumentation.enabled else None
 
         if line:
-            self.__fixed_verse = self.__fix_line(self.__preprocess(self.line))
-            self.words = self.__find_prosodic_stress(self.__fixed_verse)
+            words = self._stage('preprocess', self.__preprocess, self.line, doc)
+            self.__fixed_verse = self.__fix_line(words)
+            self.words = self._stage('find_prosodic_stress', self.__find_prosodic_stress, self.__fixed_verse)
         else:
             self.words = []
 
-    def __preprocess(self, transcription):
+    def _stage(self, stage, method, *args):
+        """
+        Call the method of a stage, timing it if instrumentation is enabled.
+
+        :param stage: The name of the stage.
+        :param method: The method.
+        :param args: The arguments of the method.
+        :return: The value returned by the method.
+        """
+        if self.metrics is None:
+            return method(*args)
+        start = perf_counter()
+        result = method(*args)
+        self.metrics.time(stage, start)
+        return result
+
+    def __preprocess(self, transcription, doc=None):
         """
         Preprocess the input line by cleaning up symbols and preparing it for further processing.
 
+        The words of the document are copied, so that it is not modified and
+        can be shared between threads.
+
         :param transcription: The raw input line.
+        :param doc: An optional document already tagged for the line.
         :return: A processed list of words.
         """
-        # Preprocessing substitutions
-        transcription = re.sub(r'[Pp]ara\,', 'Ppara,', transcription)
-        symbols = {
-            '(': '.', ')': '.', '—': '.', '…': '.', '‘': ' ', '’': ' ',
-            ';': '.', ':': '.', '?': '.', '!': '.', '"': ' ', '-': ' ',
-            'õ': 'o', 'æ': 'ae', 'à': 'a', 'è': 'e', 'ì': 'i', 'ò': 'o',
-            'ù': 'u', '«': ' ', '»': ' ', '–': '.', '“': ' ', '”': ' ',
-            "'": ' ', '.': '. '
-        }
-
-        if transcription == transcription:  # This condition is redundant, always True
-            for symbol, replacement in symbols.items():
-                transcription = transcription.replace(symbol, f'{replacement} ')
-            transcription = re.sub(r'\s*\.+(\w)', r',\1', transcription)
-            transcription = re.sub(r'\s*\,+(\w)', r',\1', transcription)
-            transcription = re.sub(r'\[|\]|¿|¡|^\s*[\.\,]', '', transcription)
-            transcription = re.sub(r'\s*\.[\.\s]+', ', ', transcription)
-            transcription = transcription.strip()
-
-        verse = nlp(transcription)
+        verse = doc if doc is not None else get_pipeline()(prepare_line(transcription))
         processed_words = []
+        if self.metrics is not None:
+            self.metrics.count('stanza_tokens', sum(len(sentence.tokens) for sentence in verse.sentences))
 
         for sentence in verse.sentences:
             used_ids = set()
             for word in sentence.words:
                 if word.parent.id not in used_ids:
                     used_ids.add(word.parent.id)
-                    word.text = word.parent.text
-                    processed_words.append(word)
-                word.text = word.text.strip('.')
+                    processed_words.append(Word(word.id, word.parent.text.strip('.'), word.upos, word.feats,
+                                                word.deprel, word.parent, word.lemma, word.xpos, word.head))
 
         return processed_words
 
@@ -150,7 +498,7 @@ class PlayLine:
             words[-2].text = words[-2].parent.text
             words.pop()
 
-        return self.__set_features(words)
+        return self._stage('set_features', self.__set_features, words)
 
     def __set_features(self, words):
         """
@@ -163,12 +511,11 @@ class PlayLine:
         for word in words:
             if word.text.isalpha():
                 exceptions = 2 if any(x in word.text for x in 'äëïöü') else 1
-                transcription = Transcription(word.text, mono=True, epenthesis=True, aspiration=True, stress='ˈ', exceptions=exceptions)
                 features.append(
                     Features(
                         text=word.text,
                         pos=word.upos,
-                        phon=transcription.phonology.syllables,
+                        phon=syllabify(word.text, exceptions, self.metrics),
                         feats=self.__parse_feats(word.feats),
                         dep=word.deprel,
                         ton=False
@@ -330,90 +677,252 @@ class VerseMetre(PlayLine):
     Class to analyze the metrical structure of a verse.
     """
     most_common = [6, 7, 8, 11, 10, 9, 14, 12, 5, 15, 4]
+    # Cost of a hiatus or a contracted syllable when scoring the alternatives
+    hiatus_cost = 10
+    fields = ('syllables', 'count', 'rhythm', 'nuclei', 'asson', 'rhyme',
+              'ambiguity', 'natural', 'estimate', 'expected_syl')
+
+    def __init__(self, line, expected_syl=False, adso=False, doc=None, deferred=False):
+        try:
+            super().__init__(line, adso, doc)
+            self.__search = None
+            if self.words:
+                self.__parsed = SyllableArray(self.words)
+                natural_syllables = len(self.__parsed) + self.__find_rhyme(self.words[-1])['count']
+                self.synaloephas = self._stage('find_synaloephas', self.__find_synaloephas, self.__parsed)
+                normalsyn = [a for a in self.synaloephas if a[1] > -15]
+                self.natural = natural_syllables - len(normalsyn)
+                self.estimate, self.expected_syl = self.__adjust_expected(self.words, self.synaloephas, expected_syl)
+                if not deferred:
+                    self.__set_metre()
+            else:
+                self.synaloephas = self.syllables = self.expected_syl = []
+                self.estimate = self.count = 0
+                self.ambiguity = self.asson = self.rhyme = False
+                self.nuclei = self.rhythm = ''
+                self.natural = 0
+        except Exception:
+            if self.metrics is not None:
+                instrumentation.record(self.metrics, failed=True)
+            raise
+        if self.metrics is not None and not deferred:
+            instrumentation.record(self.metrics)
+
+    def scan(self, expected_syl=False):
+        """
+        Adjust the metre of a verse created with deferred=True.
 
-    def __init__(self, line, expected_syl=False, adso=False):
-        super().__init__(line, adso)
-        if self.words:
-            natural_syllables = len(self.__flatten(self.words)) + self.__find_rhyme(self.words[-1])['count']
-            self.synaloephas = self.__find_synaloephas(self.words)
-            normalsyn = [a for a in self.synaloephas if a[1] > -15]
-            self.natural = natural_syllables - len(normalsyn)
-            self.estimate, self.expected_syl = self.__adjust_expected(self.words, self.synaloephas, expected_syl)
-            self.__verse = self.__adjust_metre(self.words, self.expected_syl)
-            self.syllables = self.__verse.slbs
-            self.ambiguity = self.__verse.amb
-            self.asson = self.__verse.asson
-            self.rhyme = self.__verse.cons
-            self.count = self.__verse.count
-            self.nuclei = self.find_nuclei(self.syllables)
-            self.rhythm = self.find_rhyhtm(self.nuclei)
-        else:
-            self.synaloephas = self.syllables = self.expected_syl = []
-            self.estimate = self.count = 0
-            self.ambiguity = self.asson = self.rhyme = False
-            self.nuclei = self.rhythm = ''
-            self.natural = 0
+        Only the natural and estimated counts are found when the verse is
+        created deferred, so that the expected counts can be chosen from them.
+
+        :param expected_syl: The list of expected syllable counts.
+        :return: The VerseMetre object.
+        """
+        try:
+            if self.words:
+                self.estimate, self.expected_syl = self.__adjust_expected(self.words, self.synaloephas, expected_syl)
+                self.__set_metre()
+        except Exception:
+            if self.metrics is not None:
+                instrumentation.record(self.metrics, failed=True)
+            raise
+        if self.metrics is not None:
+            instrumentation.record(self.metrics)
+        return self
+
+    def __set_metre(self):
+        """
+        Adjust the metre to the expected counts and set the results.
+        """
+        self.__verse = self._stage('adjust_metre', self.__adjust_metre, self.__parsed, self.expected_syl)
+        self.syllables = self.__verse.slbs
+        self.ambiguity = self.__verse.amb
+        self.asson = self.__verse.asson
+        self.rhyme = self.__verse.cons
+        self.count = self.__verse.count
+        self.nuclei = self.find_nuclei(self.syllables)
+        self.rhythm = self.find_rhyhtm(self.nuclei)
+
+    def to_dict(self):
+        """
+        Return the results of the scansion.
 
-    def __find_synaloephas(self, words, h=False):
+        :return: A dictionary with the verse and the public results.
+        """
+        return {'line': self.line, **{field: getattr(self, field) for field in self.fields}}
+
+    def __find_synaloephas(self, verse, h=False):
         """
         Identify and evaluate potential synaloephas (elision of vowels between words).
 
-        :param words: The list of words in the verse.
+        :param verse: The SyllableArray of the words in the verse.
         :param h: Flag for handling aspirated 'h'.
         :return: A list of tuples representing synaloephas.
         """
-        synaloephas, ant = [], ['X']
-        preference = offset = 0
+        synaloephas = self.__candidates(self.__junctions(verse))
+        synaloephas.sort(key=lambda x: x[1], reverse=True)
+        return synaloephas
 
-        for idx, word in enumerate(words):
-            coda = word[0].replace('ʰ', '')
-            onset = ant[-1]
-            s = False
+    def __word_junction(self, verse, idx):
+        """
+        Evaluate the synaloepha between a word and the previous one.
 
-            if idx != 0 and all(x.lower() in allvoc for x in (coda[0], onset[-1])):
-                position = [idx - 1, len(words[idx - 1]) - 1]
+        :param verse: The SyllableArray of the words in the verse.
+        :param idx: The index of the word.
+        :return: A list with the change in preference it brings to the following words, and the onset and coda
+                 of the synaloepha, which are None if there is none.
+        """
+        words = verse.texts
+        coda, onset = verse.word(idx)[0], verse.word(idx - 1)[-1]
+        preference = 0
+        s = False
 
-                if idx == 1 and words[0] in (['i'], ['o']) and coda[0] in 'AEIOU':
-                    preference -= 8
+        if coda.vowel_initial and onset.closes:
+            if idx == 1 and words[0] in (['i'], ['o']) and coda.initial in 'AEIOU':
+                preference -= 8
 
-                if word in [[x] for x in 'ei'] and len(words) > idx + 2 and not words[idx + 1][0][0] in allvoc:
+            if words[idx] in (['e'], ['i']) and len(words) > idx + 2 and not verse.word(idx + 1)[0].opens:
+                s = True
+            else:
+                previous_val, val = onset.closing
+                coda_val, next_val = coda.opening
+
+                if (previous_val <= val <= coda_val) or \
+                        (previous_val >= val >= coda_val and next_val <= coda_val) or \
+                        (previous_val <= val > coda_val >= next_val):
                     s = True
-                else:
-                    val = values[onset[-1]]
-                    previous_val = values[onset[-2]] if len(onset) > 1 and onset[-2] in values else values[onset[-1]]
-                    next_val = values[coda[1]] if len(coda) > 1 and coda[1] in values else values[coda[0]]
 
-                    if (previous_val <= val <= values[coda[0]]) or \
-                            (previous_val >= val >= values[coda[0]] and next_val <= values[coda[0]]) or \
-                            (previous_val <= val > values[coda[0]] >= next_val):
-                        s = True
+        if s:
+            if coda.initial == onset.final and (coda.initial + onset.final).islower():
+                if any(x in (['o'], ['y']) for x in (words[idx], words[idx - 1])):
+                    preference -= 1
+                elif coda.gliding:
+                    preference -= 2
+            return [preference, onset.text, coda.bare]
 
-            if s:
-                if (coda[0] + onset[-1]).islower() and coda[0] == onset[-1]:
-                    if any(x in (['o'], ['y']) for x in (word, ant)):
-                        preference -= 1
-                    elif len(coda) > 1 and coda[1] in 'jwăĕŏ':
-                        preference -= 2
+        return [preference, None, None]
 
-                synaloephas.append((position, self.__synaloepha_pref(onset, coda, preference), onset, coda))
+    def __syllable_junction(self, verse, idx, idy):
+        """
+        Evaluate the synaloepha between a syllable and the previous one in the same word.
 
-            ant = word
-            offset += len(word)
+        :param verse: The SyllableArray of the words in the verse.
+        :param idx: The index of the word.
+        :param idy: The index of the syllable.
+        :return: A tuple with the preference, onset and coda of the synaloepha, or None if there is none.
+        """
+        preference = -12
+        word = verse.word(idx)
+        coda = word[idy]
+        onset = word[idy - 1]
+        if onset.closes and coda.opens and \
+                not (onset.final.isupper() and idx + 1 == len(verse.texts) and idy + 1 == len(word)):
+            return self.__synaloepha_pref(onset.text, coda.text) + preference - 2, onset.text, coda.text
+        return None
+
+    def __junctions(self, verse):
+        """
+        Evaluate the candidate synaloephas at every junction of the verse.
 
-        for idx, word in enumerate(words):
-            if len(word) > 1:
-                preference = -12
-                for idy, syllable in enumerate(word):
-                    if idy > 0:
-                        position = [idx, idy - 1]
-                        coda = syllable
-                        onset = word[idy - 1]
-                        if all(x in allvoc for x in [onset[-1], coda[0]]) and not (onset[-1].isupper() and idx + 1 == len(words) and idy + 1 == len(word)):
-                            synaloephas.append((position, self.__synaloepha_pref(onset, coda) + preference - 2, onset, coda))
+        :param verse: The SyllableArray of the words in the verse.
+        :return: A Junctions object.
+        """
+        words = verse.texts
+        junctions = Junctions(words, [None] + [self.__word_junction(verse, idx) for idx in range(1, len(words))],
+                              [self.__word_junctions(verse, idx) for idx in range(len(words))], verse)
+        self.__score_junctions(junctions, range(1, len(words)))
+        return junctions
 
-        synaloephas.sort(key=lambda x: x[1], reverse=True)
+    def __word_junctions(self, verse, idx):
+        return [None] + [self.__syllable_junction(verse, idx, idy) for idy in range(1, len(verse.texts[idx]))]
+
+    def __score_junctions(self, junctions, changed):
+        """
+        Score the synaloephas between words after some of their junctions have changed.
+
+        The preference of a synaloepha accumulates the changes brought by the
+        previous junctions, so only those whose accumulated preference differs are
+        scored again.
+
+        :param junctions: A Junctions object.
+        :param changed: The indices of the words whose junctions with the previous word have changed.
+        """
+        preference = 0
+        between = junctions.between
+        for idx in range(1, len(between)):
+            junction = between[idx]
+            preference += junction[0]
+            if junction[1] is not None and (idx in changed or junction[3] != preference):
+                if self.metrics is not None:
+                    self.metrics.count('junctions_rescored')
+                between[idx] = junction[:3] + [preference, self.__synaloepha_pref(junction[1], junction[2], preference)]
+
+    @staticmethod
+    def __candidates(junctions):
+        """
+        List the candidate synaloephas of the verse, in the order they are found.
+
+        :param junctions: A Junctions object.
+        :return: A list of tuples representing synaloephas.
+        """
+        words = junctions.words
+        synaloephas = [([idx - 1, len(words[idx - 1]) - 1], junction[4], junction[1], junction[2])
+                       for idx, junction in enumerate(junctions.between) if junction and junction[1] is not None]
+        synaloephas += [([idx, idy - 1], junction[0], junction[1], junction[2])
+                        for idx, word in enumerate(junctions.within)
+                        for idy, junction in enumerate(word) if junction is not None]
         return synaloephas
 
+    def __best_synaloepha(self, junctions):
+        """
+        Find the preferred synaloepha of the verse, i.e. the first of those with the highest preference.
+
+        :param junctions: A Junctions object.
+        :return: A tuple representing the synaloepha, or None if there is none.
+        """
+        best = None
+        words = junctions.words
+        for idx, junction in enumerate(junctions.between):
+            if junction and junction[1] is not None and (best is None or junction[4] > best[1]):
+                best = ([idx - 1, len(words[idx - 1]) - 1], junction[4], junction[1], junction[2])
+        for idx, word in enumerate(junctions.within):
+            for idy, junction in enumerate(word):
+                if junction is not None and (best is None or junction[0] > best[1]):
+                    best = ([idx, idy - 1], junction[0], junction[1], junction[2])
+        return best
+
+    def __merge_junctions(self, junctions, synaloepha):
+        """
+        Apply a synaloepha and update the junctions around it.
+
+        Only the junctions of the merged word and its neighbours are evaluated
+        again, and those between words whose preference has changed.
+
+        :param junctions: A Junctions object.
+        :param synaloepha: A tuple representing the synaloepha to apply.
+        :return: A Junctions object for the updated list of words.
+        """
+        words = junctions.words
+        idx, idy = synaloepha[0]
+        between, within = junctions.between[:], junctions.within[:]
+        merged = self.__adjust_syllables(words[:], [synaloepha])
+
+        changed = {idx - 1, idx, idx + 1}
+        joined = idy == len(words[idx]) - 1
+        if joined:
+            del between[idx + 1]
+            del within[idx + 1]
+            changed.update(position for position, word in enumerate(merged) if word in (['e'], ['i']))
+        verse = junctions.verse.replace(merged, idx, idx + 1 + joined)
+        within[idx] = self.__word_junctions(verse, idx)
+        changed.intersection_update(range(1, len(merged)))
+        for position in changed:
+            between[position] = self.__word_junction(verse, position)
+
+        junctions = Junctions(merged, between, within, verse)
+        self.__score_junctions(junctions, changed)
+        return junctions
+
     def __adjust_expected(self, syllables, synaloephas, expected):
         """
         Adjust the expected number of syllables based on synaloephas.
@@ -447,57 +956,319 @@ class VerseMetre(PlayLine):
 
         return syllable_count, exp + [a for a in expected if a not in exp]
 
-    def __adjust_metre(self, syllables, expected):
+    def __adjust_metre(self, verse, expected):
         """
         Adjust the metre of the verse to match the expected syllable count.
 
-        :param syllables: The list of syllables in the verse.
+        The expected counts are tried in order of preference. The synaloephas and
+        hiatuses of the verse are found once, and every count is resolved from
+        them, so trying the next count does not scan the verse again. A verse
+        that cannot be resolved raises IndexError: either none of the counts is
+        reached, or the hiatuses that should lengthen it fall short of a count,
+        in which case the following counts are not tried.
+
+        :param verse: The SyllableArray of the words in the verse.
         :param expected: The expected number of syllables.
         :return: A VerseFeatures object representing the adjusted verse.
         """
-        potential_synaloephas = self.__find_synaloephas(syllables)
-        potential_hiatuses = self.__find_hiatuses(syllables)
+        search = self.__metre_search(verse)
+
+        for target in expected:
+            if self.metrics is not None:
+                self.metrics.count('adjust_metre_depth')
+                self.metrics.distinct('expected_tried', target)
+            resolution = self.__resolve_metre(search, target)
+
+            if resolution.count == target:
+                return VerseFeatures(self.__replace_initials(resolution.slbs), resolution.amb, resolution.count,
+                                     resolution.asson, resolution.cons)
+            elif resolution.hiatus:
+                raise IndexError(f'no resolution with hiatuses for {target} syllables')
+
+        raise IndexError('no resolution for the expected syllable counts')
+
+    @staticmethod
+    def __replace_initials(words):
+        """
+        Replace the conjunction 'y' and other initial syllables by their pronunciation.
+
+        The words are copied, since they are shared with the other resolutions of the verse.
+
+        :param words: The list of syllables of the resolution.
+        :return: The updated list of syllables.
+        """
+        syllables = [word[:] for word in words]
+        rep = {'y': 'i', 'Y': 'I', 'ppA': 'pA'}
+        for i, s in enumerate(syllables):
+            if s[0] in rep:
+                syllables[i][0] = rep[s[0]]
+        return syllables
+
+    def alternatives(self, k=3, expected_syl=None):
+        """
+        Find the best resolutions of the verse among its expected counts.
+
+        They all come from the synaloephas and hiatuses of the analysis of the
+        verse, so it is neither tagged nor transcribed again. The search is not
+        kept by the scansion, to save memory, but it is kept after the first
+        call for the following ones. Besides the
+        resolution of the scansion, every count is resolved with other choices of
+        synaloephas or hiatuses, so that a count can give several alternatives.
+        The score is 0 for the verse as naturally pronounced; every synaloepha
+        made or undone against its preference and every hiatus or contracted
+        syllable lowers it.
+
+        The synaloephas, hiatuses and contracted syllable are given as junction
+        positions: the indices of the word and syllable of the verse, before any
+        synaloepha or hiatus, that ends the junction merged or that is split or
+        contracted.
+
+        :param k: The number of alternatives.
+        :param expected_syl: The list of counts to try, or None for the expected counts of the verse.
+        :return: A list of Alternative objects, the best first.
+        """
+        if not self.words:
+            return []
+        if self.__search is None:
+            self.__search = self.__metre_search(self.__parsed)
+        search = self.__search
+
+        alternatives = {}
+        for target in dict.fromkeys(expected_syl or self.expected_syl):
+            resolution = self.__resolve_metre(search, target)
+            if resolution.count != target:
+                continue
+            if resolution.hiatus:
+                variants = self.__hiatus_variants(search, target - search.length, k)
+            else:
+                variants = self.__merge_variants(search, resolution.merges, k)
+            for words, origins, junctions, cost, synaloephas, hiatuses in variants:
+                contracted = None
+                if resolution.amb == 2:
+                    hemistich = self.__test_hemistich(junctions.verse)
+                    if hemistich > 0:
+                        contracted = origins[hemistich][-2]
+                        words = self.__resolve_long(words[:], hemistich)
+                rhyme = self.__find_rhyme(words[-1])
+                syllables = self.__replace_initials(words)
+                key = tuple(map(tuple, syllables))
+                if len(self.__flatten(words)) + rhyme['count'] != target or key in alternatives:
+                    continue
+                nuclei = self.find_nuclei(syllables)
+                score = -cost - self.__unmade(junctions) - self.hiatus_cost * (len(hiatuses) + (contracted is not None))
+                alternatives[key] = Alternative(target, syllables, self.find_rhyhtm(nuclei), nuclei, rhyme['assonance'],
+                                                rhyme['consonance'], resolution.amb, synaloephas, hiatuses, contracted,
+                                                score)
+
+        return sorted(alternatives.values(), key=lambda alternative: -alternative.score)[:k]
+
+    def __merge_variants(self, search, merges, width):
+        """
+        Apply a number of synaloephas to the verse in several ways.
+
+        The first way is the one of the scansion, which applies the preferred
+        synaloepha at every step. The others come from trying every candidate
+        at every step and keeping the width cheapest ways.
+
+        :param search: A MetreSearch object.
+        :param merges: The number of synaloephas to apply.
+        :param width: The number of ways kept at every step.
+        :return: A list of tuples with the syllables, the junction positions of their syllables, the junctions,
+                 the cost of the synaloephas made against their preference, their positions and no hiatuses.
+        """
+        self.__merged(search, merges)
+        initial = (0, [], search.merged[0],
+                   [[(idx, idy) for idy in range(len(word))] for idx, word in enumerate(search.syllables)])
+        scansion, beam = initial, [initial]
+        for step in range(merges):
+            synaloepha = search.applied[step]
+            if synaloepha is not None:
+                scansion = self.__merge_state(scansion, synaloepha, search.merged[step + 1])
+            expanded = {}
+            for state in beam:
+                candidates = self.__candidates(state[2])
+                if not candidates:
+                    expanded.setdefault(tuple(map(tuple, state[2].words)), state)
+                for synaloepha in candidates:
+                    merged = self.__merge_state(state, synaloepha, self.__merge_junctions(state[2], synaloepha))
+                    key = tuple(map(tuple, merged[2].words))
+                    if key not in expanded or merged[0] < expanded[key][0]:
+                        expanded[key] = merged
+            beam = sorted(expanded.values(), key=lambda state: state[0])[:width]
+
+        return [(junctions.words, origins, junctions, cost, sorted(positions), [])
+                for cost, positions, junctions, origins in [scansion] + beam]
+
+    def __merge_state(self, state, synaloepha, junctions):
+        """
+        Follow a way of applying synaloephas through one more synaloepha.
+
+        :param state: A tuple with the cost, the positions of the synaloephas, the junctions and the junction
+                      positions of the syllables.
+        :param synaloepha: A tuple representing the synaloepha to apply.
+        :param junctions: The Junctions object after applying it.
+        :return: The updated tuple.
+        """
+        cost, positions, _, origins = state
+        idx, idy = synaloepha[0]
+        return (cost + max(0, -15 - synaloepha[1]), positions + [origins[idx][idy]], junctions,
+                self.__merge_origins(origins, synaloepha[0]))
+
+    def __hiatus_variants(self, search, count, width):
+        """
+        Apply a number of hiatuses to the verse in several ways, in the order of preference of the hiatuses.
+
+        :param search: A MetreSearch object.
+        :param count: The number of hiatuses to apply.
+        :param width: The number of ways.
+        :return: A list of tuples with the syllables, no junction positions, the junctions of the verse, no cost
+                 of synaloephas, no synaloephas and the positions of the hiatuses.
+        """
+        order = self.__hiatus_order(search.syllables, search.hiatuses)
+        return [(self.__apply_hiatus(search.syllables[:], sorted(hiatuses, reverse=True)), None, search.merged[0],
+                 0, [], sorted(hiatuses))
+                for hiatuses in islice(combinations(order, count), width)]
+
+    @staticmethod
+    def __merge_origins(origins, position):
+        """
+        Follow the junction positions of the syllables through a synaloepha.
+
+        A merged syllable takes the position of the last syllable it merges.
+
+        :param origins: The junction positions of the syllables, as nested as the words of the verse.
+        :param position: The position of the first syllable merged, as in the synaloephas.
+        :return: The updated junction positions.
+        """
+        idx, idy = position
+        origins = origins[:]
+        if idy == len(origins[idx]) - 1:
+            origins[idx:idx + 2] = [origins[idx][:-1] + origins[idx + 1]]
+        else:
+            origins[idx] = origins[idx][:idy] + origins[idx][idy + 1:]
+        return origins
+
+    def __unmade(self, junctions):
+        """
+        Measure the preference of the synaloephas naturally made that a resolution leaves unmade.
+
+        :param junctions: A Junctions object for the syllables of the resolution.
+        :return: The sum of the preferences above the threshold of natural synaloephas.
+        """
+        unmade = 0
+        synaloepha = self.__best_synaloepha(junctions)
+        while synaloepha is not None and synaloepha[1] > -15:
+            unmade += synaloepha[1] + 15
+            junctions = self.__merge_junctions(junctions, synaloepha)
+            synaloepha = self.__best_synaloepha(junctions)
+        return unmade
+
+    def __metre_search(self, verse):
+        """
+        Find the synaloephas and hiatuses that can adjust the metre of the verse.
+
+        :param verse: The SyllableArray of the words in the verse.
+        :return: A MetreSearch object.
+        """
+        syllables = verse.texts
+        junctions = self.__junctions(verse)
+        potential_synaloephas = self.__candidates(junctions)
+        potential_synaloephas.sort(key=lambda x: x[1], reverse=True)
+        potential_hiatuses = self.__find_hiatuses(verse)
         rhyme = self.__find_rhyme(syllables[-1])
-        len_rhyme = len(self.__flatten(syllables)) + rhyme['count']
-        offset = expected[0] - len_rhyme
-        sllbls = syllables[:]
+        len_rhyme = len(verse) + rhyme['count']
+
+        return MetreSearch(syllables, potential_synaloephas, potential_hiatuses,
+                           self.__hiatus_preference(syllables, potential_hiatuses),
+                           len_rhyme, [junctions], [syllables], {}, [])
+
+    def __resolve_metre(self, search, target):
+        """
+        Resolve the metre of the verse for an expected syllable count.
+
+        :param search: A MetreSearch object.
+        :param target: The expected number of syllables.
+        :return: A Resolution object, whose count may differ from the target.
+        """
+        if target in search.resolutions:
+            return search.resolutions[target]
+
+        len_rhyme = search.length
+        n_synaloephas = len(search.synaloephas)
+        offset = target - len_rhyme
+        syllables = search.syllables
+        hiatus = False
+        merges, contracted = 0, None
 
         if offset == 0:
             ambiguous = 0
-        elif len_rhyme - len(potential_synaloephas) == expected[0]:
+        elif len_rhyme - n_synaloephas == target:
             ambiguous = 0
-            syllables = self.__synaloephas(syllables, -offset)
-        elif len_rhyme - len(potential_synaloephas) > expected[0]:
+            merges = max(-offset, 0)
+            syllables = self.__merged(search, merges)
+        elif len_rhyme - n_synaloephas > target:
             ambiguous = 2
-            syllables = self.__synaloephas(syllables, -offset - 1)
-            hemistich = self.__test_hemistich(syllables)
-            if self.__test_hemistich(syllables) > 0:
-                syllables = self.__resolve_long(syllables, hemistich)
-                len_rhyme -= 1
+            merges = max(-offset - 1, 0)
+            syllables = self.__merged(search, merges)
+            hemistich = self.__test_hemistich(search.merged[merges].verse)
+            if hemistich > 0:
+                contracted = hemistich
+                syllables = self.__resolve_long(syllables[:], hemistich)
         else:
             ambiguous = 1
-            if offset < 0 and len(potential_synaloephas) >= -offset:
-                syllables = self.__synaloephas(syllables, -offset)
-            elif (len_rhyme < expected[0] > 4 and len(potential_hiatuses) + len_rhyme >= expected[0]):
-                expected = expected[:1] + expected
-                syllables = self.__apply_hiatus(syllables, potential_hiatuses, offset)
+            if offset < 0 and n_synaloephas >= -offset:
+                merges = -offset
+                syllables = self.__merged(search, merges)
+            elif len_rhyme < target > 4 and len(search.hiatuses) + len_rhyme >= target:
+                hiatus = True
+                syllables = self.__split(search, offset)
 
         rhyme = self.__find_rhyme(syllables[-1])
         len_rhyme = len(self.__flatten(syllables)) + rhyme['count']
+        resolution = Resolution(syllables, ambiguous, len_rhyme, rhyme['assonance'], rhyme['consonance'], hiatus,
+                                merges, contracted)
+        search.resolutions[target] = resolution
 
-        if len_rhyme > expected[0]:
-            verse = self.__adjust_metre(sllbls, expected[1:])
-        elif len_rhyme < expected[0]:
-            verse = self.__adjust_metre(sllbls, expected[1:])
-        else:
-            rep = {'y': 'i', 'Y': 'I', 'ppA': 'pA'}
-            for i, s in enumerate(syllables):
-                if s[0] in rep:
-                    syllables[i][0] = rep[s[0]]
+        return resolution
+
+    def __merged(self, search, count):
+        """
+        Return the syllables of the verse after applying its best synaloephas one by one.
+
+        The candidates are kept from one synaloepha to the next and only those
+        around the merged syllables are evaluated again.
+
+        :param search: A MetreSearch object.
+        :param count: The number of synaloephas to apply.
+        :return: The updated list of syllables.
+        """
+        merged = search.merged
+        while len(merged) <= count:
+            if self.metrics is not None:
+                self.metrics.count('synaloepha_rescans')
+            synaloepha = self.__best_synaloepha(merged[-1])
+            search.applied.append(synaloepha)
+            if synaloepha is None:
+                merged.append(Junctions(merged[-1].words[:], merged[-1].between, merged[-1].within,
+                                        merged[-1].verse))
+            else:
+                merged.append(self.__merge_junctions(merged[-1], synaloepha))
+
+        return merged[max(count, 0)].words
+
+    def __split(self, search, count):
+        """
+        Return the syllables of the verse after applying its preferred hiatuses one by one.
 
-            verse = VerseFeatures(syllables, ambiguous, len_rhyme, rhyme['assonance'], rhyme['consonance'])
+        :param search: A MetreSearch object.
+        :param count: The number of hiatuses to apply.
+        :return: The updated list of syllables.
+        """
+        split = search.split
+        while len(split) <= count:
+            split.append(self.__apply_hiatus(split[-1][:], search.preference[len(split) - 1:len(split)]))
 
-        return verse
+        return split[count]
 
     @staticmethod
     def find_nuclei(syllables):
@@ -529,9 +1300,25 @@ class VerseMetre(PlayLine):
         :param preference: The initial preference value.
         :return: The calculated preference value.
         """
+        key = (onset, coda, preference)
+        score = junction_scores.get(key)
+        if score is None:
+            score = self.__score_synaloepha(onset, coda, preference)
+            junction_scores.put(key, score)
+        return score
+
+    def __score_synaloepha(self, onset, coda, preference):
+        """
+        Calculate the preference for synaloepha, as cached by __synaloepha_pref.
+
+        :param onset: The onset (initial consonant cluster or vowel) of the syllable.
+        :param coda: The coda (final consonant cluster or vowel) of the preceding syllable.
+        :param preference: The initial preference value.
+        :return: The calculated preference value.
+        """
+        onset, coda = parse_syllable(onset), parse_syllable(coda)
         distance = self.__vowel_distance(onset, coda)
-        onset = ''.join([x for x in onset if x in allvoc])
-        coda = ''.join([x for x in coda if x in allvoc])
+        onset, coda = onset.vocalic, coda.vocalic
 
         preference -= 2 * (len(onset) + len(coda) - 2 + distance)
         if coda.startswith('ʰ'):
@@ -555,108 +1342,64 @@ class VerseMetre(PlayLine):
         return preference
 
     @staticmethod
-    def __find_hiatuses(words):
+    def __find_hiatuses(verse):
         """
         Identify potential hiatuses (separation of diphthongs) in the verse.
 
-        :param words: The list of words in the verse.
+        :param verse: The SyllableArray of the words in the verse.
         :return: A list of tuples representing the positions of hiatuses.
         """
         diphthongs = []
 
-        for idx, word in enumerate(words):
-            ton = 0
-
-            for idy, syllable in enumerate(reversed(word)):
-                if any(char.isupper() for char in syllable):
-                    ton = len(word) - idy - 1
+        for idx, word in enumerate(verse.words()):
+            ton = next((idy for idy, syllable in enumerate(word) if syllable.stressed), 0)
 
             for idy, syllable in enumerate(word):
-                if rg := re.search(r'([wj][AEOIaeoi])|([AEOIaeoi][wj])', syllable):
-                    if idy < ton or (rg.group(1) and not rg.group(1).islower()):
-                        diphthongs.append((idx, idy))
+                if syllable.glide and (idy < ton or syllable.rising):
+                    diphthongs.append((idx, idy))
 
         return diphthongs
 
-    def __apply_hiatus(self, words, hiatuses, difference):
+    @staticmethod
+    def __apply_hiatus(words, preference):
         """
         Apply hiatus to separate diphthongs where necessary.
 
         :param words: The list of words in the verse.
-        :param hiatuses: The list of identified hiatuses.
-        :param difference: The difference in syllable count to be adjusted.
+        :param preference: The positions of the hiatuses to apply, as sorted by __hiatus_preference.
         :return: The updated list of words with hiatus applied.
         """
-        sem2voc = {'j': 'i', 'w': 'u', 'J': 'I', 'W': 'U'}
-        preference = self.__hiatus_preference(words, hiatuses)
-
-        for idx in preference[:difference]:
+        for idx in preference:
             word = words[idx[0]]
-            syllable = word[idx[1]]
-            diphthong = re.search(r'([jw]*)([aeiouAEIOUjw])([jw]*)', syllable)
-
-            if len(diphthong.group()) > 1:
-                onset = syllable.split(diphthong.group())[0]
-                coda = syllable.split(diphthong.group())[1]
-                semiconsonant = diphthong.group(1)
-                nucleus = diphthong.group(2)
-                semivowel = diphthong.group(3)
-
-                if semivowel and nucleus:
-                    if nucleus.isupper():
-                        nucleus, semivowel = nucleus.lower(), semivowel.upper()
-                    first = onset + nucleus
-                    second = semivowel.replace(semivowel[-1], sem2voc[semivowel[-1]]) + coda
-                else:
-                    first = onset + semiconsonant.replace(semiconsonant[-1], sem2voc[semiconsonant[-1]])
-                    second = nucleus + coda
-
-                hiatus = f'{first} {second}'
-                word = [(index, element) if index != idx[1] else (idx[1], hiatus) for index, element in enumerate(word)]
+            syllable = parse_syllable(word[idx[1]])
+
+            if len(syllable.diphthong) > 1:
+                word = [(index, element) if index != idx[1] else (idx[1], syllable.hiatus) for index, element in enumerate(word)]
                 words[idx[0]] = re.split(' +', ' '.join([element[1] for element in word]))
 
         return words
 
-    def __test_hemistich(self, word_list):
+    def __test_hemistich(self, verse):
         """
         Test for hemistich (a pause or break in the verse) to adjust the verse structure.
 
-        :param word_list: The list of words in the verse.
+        :param verse: The SyllableArray of the words in the verse.
         :return: The index position for potential adjustment.
         """
-        offset = i = correction = 0
+        offset = correction = 0
+        word_list = verse.texts
 
-        for idx, word in enumerate(word_list):
-            if len(self.__flatten(word_list)) > 9:
+        if len(verse) > 9:
+            for idx, word in enumerate(verse.words()):
                 for idy, syllable in enumerate(word):
-                    if any(x in syllable for x in 'AEIOU') and idy + offset in (3, 5):
-                        if len(word) - idy > 2 and word[-2:] != ['mEn', 'te']:
+                    if syllable.tonic and idy + offset in (3, 5):
+                        if len(word) - idy > 2 and word_list[idx][-2:] != ['mEn', 'te']:
                             correction = idx
                         break
-                    i += 1
                 offset += len(word)
-            else:
-                break
 
         return correction
 
-    def __synaloephas(self, syllables, offset, count=0):
-        """
-        Apply synaloephas to adjust the syllable count.
-
-        :param syllables: The list of syllables in the verse.
-        :param offset: The offset to apply.
-        :param count: The current count of adjustments.
-        :return: The updated list of syllables.
-        """
-        if offset > 0:
-            potential_synaloephas = self.__find_synaloephas(syllables)
-            count += 1
-            syllables = self.__adjust_syllables(syllables, potential_synaloephas[:1])
-            syllables = self.__synaloephas(syllables, offset - 1, count)
-
-        return syllables
-
     @staticmethod
     def __resolve_long(words, position):
         """
@@ -680,14 +1423,12 @@ class VerseMetre(PlayLine):
         offset, tonic = {-1: 1, -2: 0, -3: -1}, -1
         coda = []
 
-        for idx, syllable in enumerate(word[::-1]):
-            if not syllable.islower():
+        for idx, syllable in enumerate(map(parse_syllable, reversed(word))):
+            if not syllable.lower:
                 tonic = -idx - 1
-                for jdx, phoneme in enumerate(syllable):
-                    if phoneme.isupper():
-                        coda = word[(idx + 1) * -1:]
-                        coda[(idx + 1) * -1] = syllable[jdx:]
-                        break
+                if syllable.stressed:
+                    coda = word[(idx + 1) * -1:]
+                    coda[0] = syllable.text[syllable.stress:]
                 break
             else:
                 coda = word[-2:]
@@ -696,11 +1437,10 @@ class VerseMetre(PlayLine):
             tonic = -2
 
         if len(coda) > 2:
-            assonance = ''.join([syl.lower() for syl in [coda[i] for i in (0, -1)]])
+            assonance = ''.join([parse_syllable(coda[i]).vowels for i in (0, -1)])
         else:
-            assonance = ''.join([syl.lower() for syl in coda])
+            assonance = ''.join([parse_syllable(syl).vowels for syl in coda])
 
-        assonance = ''.join([phoneme for phoneme in assonance if phoneme in vowels])
         consonance = ''.join([phoneme.lower() for phoneme in coda])
 
         return {'stress': tonic, 'count': offset[tonic], 'assonance': assonance, 'consonance': consonance}
@@ -784,6 +1524,20 @@ class VerseMetre(PlayLine):
         :param diphthong: The diphthong to merge.
         :return: The merged diphthong.
         """
+        key = (diphthong[0], diphthong[1])
+        merged = junction_merges.get(key)
+        if merged is None:
+            merged = self.__merge_syllables(list(key))
+            junction_merges.put(key, merged)
+        return merged
+
+    def __merge_syllables(self, diphthong):
+        """
+        Merge the vowels of two syllables, as cached by __apply_synaloephas.
+
+        :param diphthong: The two syllables to merge.
+        :return: The merged syllable.
+        """
         diphthong[1] = diphthong[1].replace('ʰ', '')
         onset, coda = diphthong[0], diphthong[1]
         onsetb = ''.join([non_syllabic[x] if x in non_syllabic else x for x in onset])
@@ -807,13 +1561,13 @@ class VerseMetre(PlayLine):
         return diphthong
 
     @staticmethod
-    def __hiatus_preference(words, hiatuses):
+    def __hiatus_order(words, hiatuses):
         """
-        Determine the preference order for applying hiatus.
+        Sort the hiatuses by preference, those of the words usually pronounced with hiatus first.
 
         :param words: The list of words in the verse.
         :param hiatuses: The list of identified hiatuses.
-        :return: A list of hiatuses sorted by preference.
+        :return: A list of the positions of the hiatuses in the words of the verse.
         """
         preference = []
 
@@ -823,6 +1577,19 @@ class VerseMetre(PlayLine):
             else:
                 preference += [idx]
 
+        return preference
+
+    @staticmethod
+    def __hiatus_preference(words, hiatuses):
+        """
+        Determine the preference order for applying hiatus.
+
+        :param words: The list of words in the verse.
+        :param hiatuses: The list of identified hiatuses.
+        :return: A list of hiatuses sorted by preference, their positions updated as the previous ones are applied.
+        """
+        preference = VerseMetre.__hiatus_order(words, hiatuses)
+
         for idx, second in enumerate(reversed(preference)):
             for first in preference[:-idx - 1]:
                 if first[0] == second[0] and first[1] < second[1]:
@@ -845,14 +1612,11 @@ class VerseMetre(PlayLine):
         """
         Calculate the distance between vowels on the trapezium.
 
-        :param onset: The onset (initial consonant cluster or vowel) of the syllable.
-        :param coda: The coda (final consonant cluster or vowel) of the preceding syllable.
+        :param onset: The parsed syllable ending in the first vowel.
+        :param coda: The parsed syllable starting with the second vowel.
         :return: The calculated distance.
         """
-        onset = onset.lower()
-        coda = coda.strip('ʰ').lower()
-
-        return sqrt((trapez[onset[-1]][0] - trapez[coda[0]][0]) ** 2 + (trapez[onset[-1]][1] - trapez[coda[0]][1]) ** 2)
+        return distances[onset.final.lower(), coda.initial.lower()]
 
     @staticmethod
     def __adjust_position(word_list, position, offset):
@@ -875,3 +1639,51 @@ class VerseMetre(PlayLine):
                 word_list[idx][0] -= 1
 
         return word_list
+
+
+def _freeze(value):
+    """
+    Convert nested lists into tuples.
+
+    :param value: A value of the results.
+    :return: The value with every list replaced by a tuple.
+    """
+    if isinstance(value, list):
+        return tuple([_freeze(item) for item in value])
+    return value
+
+
+class Scansion(namedtuple('Scansion', ('line',) + VerseMetre.fields)):
+    """
+    A class to represent the results of the scansion of a verse.
+
+    Unlike VerseMetre, it holds only the public results, in an immutable
+    tuple, and none of the intermediate analysis of the verse.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_verse(cls, verse):
+        """
+        Build the results from a scanned verse.
+
+        :param verse: A VerseMetre object.
+        :return: A Scansion object.
+        """
+        return cls(verse.line, *[_freeze(getattr(verse, field)) for field in VerseMetre.fields])
+
+    def to_dict(self):
+        """
+        Return the results of the scansion.
+
+        :return: A dictionary with the verse and the public results.
+        """
+        return dict(zip(self._fields, self))
+
+    def to_tuple(self):
+        """
+        Return the results of the scansion as a plain tuple.
+
+        :return: A tuple with the verse and the public results, in the order of the fields.
+        """
+        return tuple(self)
@@ -0,0 +1,188 @@
+"""Scansion of whole poems and plays, with the metre of each block as a hint.
+
+The verses are tagged in one pass. Their estimated counts are found first, and
+the metres of each strophe or speech block are inferred from them. Every
+verse is then scanned with those metres as its expected counts, so that it is
+resolved as the neighbouring verses are.
+"""
+from collections import Counter
+from .libEscansion import VerseMetre, Scansion
+from .batch import annotate, chunks, chunk_size
+
+# Share of the verses of a block a metre needs to be taken as one of its metres
+metre_share = 0.2
+
+
+def _error(error):
+    return f'{type(error).__name__}: {error}'
+
+
+def split_blocks(lines):
+    """
+    Split verses into blocks.
+
+    :param lines: An iterable of verses, with empty verses or None between blocks, or an iterable of lists of verses.
+    :return: A list of lists of verses.
+    """
+    blocks, block = [], []
+    for line in lines:
+        if isinstance(line, (list, tuple)):
+            if block:
+                blocks.append(block)
+                block = []
+            blocks.append([verse for verse in line if verse])
+        elif line and line.strip():
+            block.append(line)
+        elif block:
+            blocks.append(block)
+            block = []
+    if block:
+        blocks.append(block)
+    return [block for block in blocks if block]
+
+
+def block_metres(estimates, candidates, share=None):
+    """
+    Infer the metres of a block from the estimated counts of its verses.
+
+    :param estimates: The estimated counts of the verses.
+    :param candidates: The list of possible counts, in order of preference.
+    :param share: The share of the verses a metre needs, or None for metre_share.
+    :return: The list of metres of the block, the most frequent first.
+    """
+    share = metre_share if share is None else share
+    counts = Counter(estimate for estimate in estimates if estimate in candidates)
+    total = sum(counts.values())
+    metres = [metre for metre, count in counts.items() if count / total >= share] if total else []
+    return sorted(metres, key=lambda metre: (-counts[metre], candidates.index(metre)))
+
+
+def verse_hint(estimate, metres, candidates):
+    """
+    Order the expected counts of a verse.
+
+    The estimated count of the verse comes first if it is a metre of its block,
+    followed by the other metres of the block and by the rest of candidates.
+
+    :param estimate: The estimated count of the verse.
+    :param metres: The metres of the block.
+    :param candidates: The list of possible counts, in order of preference.
+    :return: The list of expected counts.
+    """
+    first = [estimate] if estimate in metres else []
+    return first + [metre for metre in metres if metre not in first] + \
+        [metre for metre in candidates if metre not in metres]
+
+
+class PlayScan:
+    """
+    A class to scan a poem or a play, block by block.
+
+    A verse that cannot be scanned is kept as None, with its error, and the
+    other verses of its block are scanned with the metres of the rest.
+    """
+
+    def __init__(self, lines, expected_syl=False, adso=False, size=None, share=None, compact=False):
+        """
+        Tag and scan the verses.
+
+        :param lines: An iterable of verses, with empty verses or None between blocks, or an iterable of lists of verses.
+        :param expected_syl: The list of possible counts, or False for the most common ones.
+        :param adso: Boolean to trigger specific behavior for 'adso' cases.
+        :param size: The number of verses tagged in each pipeline call.
+        :param share: The share of the verses of a block a metre needs, or None for metre_share.
+        :param compact: Boolean to keep Scansion objects instead of VerseMetre objects.
+        """
+        self.candidates = list(expected_syl or VerseMetre.most_common)
+        self.adso = adso
+        self.share = share
+        self.compact = compact
+        self.lines = split_blocks(lines)
+        self.blocks, self.metres, self.errors = [], [], []
+
+        flat = [line for block in self.lines for line in block]
+        deferred = []
+        for chunk in chunks(flat, size or chunk_size):
+            for line, doc in zip(chunk, annotate(chunk)):
+                try:
+                    deferred.append(VerseMetre(line, self.candidates, adso, doc=doc, deferred=True))
+                except Exception as error:
+                    deferred.append(error)
+
+        verses = iter(deferred)
+        for block in self.lines:
+            self.blocks.append(self.scan_block([next(verses) for line in block]))
+
+    def scan_block(self, verses):
+        """
+        Scan the verses of a block, created deferred, with the metres of the block.
+
+        The errors of the block are appended to errors, as a dictionary of the
+        descriptions by the position of the verse in the block.
+
+        :param verses: A list of VerseMetre objects created with deferred=True, or of the exceptions raised
+                       creating them.
+        :return: The list of scanned verses, with None for the verses that could not be scanned.
+        """
+        errors = {position: _error(verse) for position, verse in enumerate(verses) if isinstance(verse, Exception)}
+        metres = block_metres([verse.estimate for position, verse in enumerate(verses) if position not in errors],
+                              self.candidates, self.share)
+        self.metres.append(metres)
+        scanned = []
+        for position, verse in enumerate(verses):
+            if position in errors:
+                scanned.append(None)
+                continue
+            try:
+                verse.scan(verse_hint(verse.estimate, metres, self.candidates))
+            except Exception as error:
+                errors[position] = _error(error)
+                scanned.append(None)
+                continue
+            scanned.append(Scansion.from_verse(verse) if self.compact else verse)
+        self.errors.append(errors)
+        return scanned
+
+    @property
+    def verses(self):
+        """
+        Return the scanned verses of all the blocks.
+
+        :return: A list of verses in the order of the input, with None for the verses that could not be scanned.
+        """
+        return [verse for block in self.blocks for verse in block]
+
+    def error(self, idx):
+        """
+        Return the error raised by a verse.
+
+        :param idx: The index of the verse, as in verses.
+        :return: A description of the error, or None if there was none.
+        """
+        for block, errors in zip(self.blocks, self.errors):
+            if idx < len(block):
+                return errors.get(idx)
+            idx -= len(block)
+        raise IndexError('verse index out of range')
+
+    def __iter__(self):
+        return iter(self.verses)
+
+    def __len__(self):
+        return sum(len(block) for block in self.blocks)
+
+
+def scan_poem(lines, expected_syl=False, adso=False, size=None, share=None, compact=False):
+    """
+    Scan a poem or a play, using the metres of each block as hints.
+
+    :param lines: An iterable of verses, with empty verses or None between blocks, or an iterable of lists of verses.
+    :param expected_syl: The list of possible counts, or False for the most common ones.
+    :param adso: Boolean to trigger specific behavior for 'adso' cases.
+    :param size: The number of verses tagged in each pipeline call.
+    :param share: The share of the verses of a block a metre needs, or None for metre_share.
+    :param compact: Boolean to return Scansion objects instead of VerseMetre objects.
+    :return: A list of scanned verses in the order of the input, without the empty ones, and with None for
+             the verses that could not be scanned.
+    """
+    return PlayScan(lines, expected_syl, adso, size, share, compact).verses
@@ -0,0 +1,124 @@
+"""Scansion from several threads, with a pool of pipelines.
+
+A Stanza pipeline must not be called from two threads at once, so every thread
+takes a pipeline from the pool, tags a chunk of verses with it and returns it
+before scanning them. PyTorch releases the GIL while tagging, so the tagging of
+a chunk overlaps with the scansion of the others:
+
+    >>> pool = libEscansion.PipelinePool(2)
+    >>> verses = libEscansion.scan_threaded(lines, [11, 7], workers=4, pool=pool)
+"""
+from queue import Queue, Empty
+from threading import Lock
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from .libEscansion import build_pipeline
+from .batch import annotate, chunks, chunk_size, scan_verse
+
+
+class PipelinePool:
+    """
+    A class to represent a pool of pipelines shared by several threads.
+
+    The pipelines are built when they are first needed, up to the size of the pool.
+    """
+
+    def __init__(self, size=2, factory=None):
+        """
+        Initialize the PipelinePool class.
+
+        :param size: The maximum number of pipelines.
+        :param factory: A callable returning a new pipeline, or None for build_pipeline.
+        """
+        self.size = size
+        self.factory = factory or build_pipeline
+        self.built = 0
+        self.__idle = Queue()
+        self.__lock = Lock()
+
+    def checkout(self, timeout=None):
+        """
+        Take a pipeline from the pool, building one if none is idle and the pool is not full.
+
+        :param timeout: The seconds to wait for an idle pipeline, or None to wait indefinitely.
+        :return: A pipeline, which must be returned with checkin.
+        """
+        try:
+            return self.__idle.get_nowait()
+        except Empty:
+            pass
+        with self.__lock:
+            build = self.built < self.size
+            if build:
+                self.built += 1
+        if build:
+            try:
+                return self.factory()
+            except BaseException:
+                with self.__lock:
+                    self.built -= 1
+                raise
+        try:
+            return self.__idle.get(timeout=timeout)
+        except Empty:
+            raise TimeoutError(f'no pipeline was returned to the pool in {timeout} seconds') from None
+
+    def checkin(self, pipeline):
+        """
+        Return a pipeline to the pool.
+
+        :param pipeline: A pipeline taken with checkout.
+        """
+        self.__idle.put(pipeline)
+
+    @contextmanager
+    def pipeline(self, timeout=None):
+        """
+        Take a pipeline from the pool for the duration of a with block.
+
+        :param timeout: The seconds to wait for an idle pipeline, or None to wait indefinitely.
+        :return: A context manager giving the pipeline.
+        """
+        pipeline = self.checkout(timeout)
+        try:
+            yield pipeline
+        finally:
+            self.checkin(pipeline)
+
+    def __call__(self, doc):
+        """
+        Tag a text or a list of documents with a pipeline of the pool.
+
+        :param doc: The input of the pipeline.
+        :return: The tagged document or documents.
+        """
+        with self.pipeline() as pipeline:
+            return pipeline(doc)
+
+
+def _scan_chunk(chunk, expected_syl, adso, pool, compact, errors):
+    with pool.pipeline() as pipeline:
+        docs = annotate(chunk, pipeline)
+    return [scan_verse(line, expected_syl, adso, doc, compact, errors) for line, doc in zip(chunk, docs)]
+
+
+def scan_threaded(lines, expected_syl=False, adso=False, workers=4, pool=None, size=None, compact=False,
+                  errors='raise'):
+    """
+    Scan a list of verses from several threads, tagging them by chunks.
+
+    :param lines: An iterable of verses.
+    :param expected_syl: The list of expected syllable counts, as in VerseMetre.
+    :param adso: Boolean to trigger specific behavior for 'adso' cases.
+    :param workers: The number of threads.
+    :param pool: A PipelinePool, or None for a new pool with a pipeline for every two threads.
+    :param size: The number of verses tagged in each pipeline call.
+    :param compact: Boolean to return Scansion objects and drop the analysis of the verses.
+    :param errors: 'raise' or 'return', as in scan_many.
+    :return: A list of VerseMetre objects, or of Scansion objects if compact, in the order of the input.
+    """
+    pool = pool or PipelinePool(max(1, workers // 2))
+    with ThreadPoolExecutor(workers, thread_name_prefix='libEscansion') as executor:
+        futures = [executor.submit(_scan_chunk, chunk, expected_syl, adso, pool, compact, errors)
+                   for chunk in chunks(lines, size or chunk_size)]
+        return [verse for future in futures for verse in future.result()]
@@ -0,0 +1,233 @@
+"""Inverted index of the rhymes and assonances of scanned verses.
+
+Every verse gets an id, and the consonant rhymes and assonances found by the
+scansion are mapped to the ids of their verses:
+
+    >>> index = libEscansion.RhymeIndex()
+    >>> index.extend(scan_corpus(paths))
+    >>> index.rhymes('ado')
+    >>> index.assonances('aa', source='play.xml')
+    >>> index.scheme(source='sonnet.xml')
+    ['A', 'B', 'B', 'A', 'A', 'B', 'B', 'A', 'C', 'D', 'C', 'D', 'C', 'D']
+"""
+import json
+from string import ascii_uppercase
+from .libEscansion import version
+
+kinds = ('rhyme', 'asson')
+
+
+def label(idx):
+    """
+    Return the letter of a rhyme in a scheme: A to Z, then AA, AB...
+
+    :param idx: The number of the rhyme, from 0.
+    :return: The label.
+    """
+    letters = ''
+    idx += 1
+    while idx:
+        idx, rest = divmod(idx - 1, 26)
+        letters = ascii_uppercase[rest] + letters
+    return letters
+
+
+def rhyme_scheme(keys):
+    """
+    Find the rhyme scheme of the rhymes or assonances of consecutive verses.
+
+    Verses sharing a key get the same letter, in order of appearance. Verses
+    whose key is empty or does not recur among them get None.
+
+    :param keys: A list of rhymes or assonances.
+    :return: A list of labels, one for each verse.
+    """
+    counts = {}
+    for key in keys:
+        counts[key] = counts.get(key, 0) + 1
+    letters, scheme = {}, []
+    for key in keys:
+        if key and counts[key] > 1:
+            scheme.append(letters.setdefault(key, label(len(letters))))
+        else:
+            scheme.append(None)
+    return scheme
+
+
+class RhymeIndex:
+    """
+    A class to represent an index of verses by their rhyme and assonance.
+
+    Verses can be added at any time, and the verses of a source removed or
+    replaced when it is scanned again.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.verses = []
+        self.__postings = {kind: {} for kind in kinds}
+        self.__sources = {}
+
+    def __len__(self):
+        return sum(len(ids) for ids in self.__sources.values())
+
+    @property
+    def sources(self):
+        """
+        Return the sources of the verses in the index.
+
+        :return: A list of sources, in the order they were added.
+        """
+        return list(self.__sources)
+
+    def add(self, result, source=None, n=None):
+        """
+        Add a scanned verse.
+
+        :param result: A VerseMetre or Scansion object, or a dictionary as returned by to_dict or scan_corpus.
+        :param source: The source of the verse, if not in the result.
+        :param n: The number of the verse in its source, if not in the result.
+        :return: The id of the verse.
+        """
+        get = result.get if isinstance(result, dict) else lambda field: getattr(result, field, None)
+        source = source if source is not None else get('source') or ''
+        ids = self.__sources.setdefault(source, [])
+        n = n if n is not None else get('n') or len(ids) + 1
+        verse = {'id': len(self.verses), 'source': source, 'n': n, 'line': get('line') or '',
+                 'rhyme': get('rhyme') or '', 'asson': get('asson') or ''}
+        self.verses.append(verse)
+        ids.append(verse['id'])
+        for kind in kinds:
+            if verse[kind]:
+                self.__postings[kind].setdefault(verse[kind], []).append(verse['id'])
+        return verse['id']
+
+    def extend(self, results):
+        """
+        Add several scanned verses.
+
+        :param results: An iterable of results, as in add.
+        :return: The list of ids of the verses.
+        """
+        return [self.add(result) for result in results]
+
+    def remove(self, source):
+        """
+        Remove the verses of a source, e.g. before adding it scanned again.
+
+        :param source: The source.
+        :return: The number of verses removed.
+        """
+        ids = self.__sources.pop(source, [])
+        removed = set(ids)
+        for kind in kinds:
+            postings = self.__postings[kind]
+            for key in {self.verses[idx][kind] for idx in ids} - {''}:
+                postings[key] = [idx for idx in postings[key] if idx not in removed]
+                if not postings[key]:
+                    del postings[key]
+        for idx in ids:
+            self.verses[idx] = None
+        return len(ids)
+
+    def verse(self, idx):
+        """
+        Return a verse of the index.
+
+        :param idx: The id of the verse.
+        :return: A dictionary with the id, source, number, line, rhyme and assonance, or None if it was removed.
+        """
+        return self.verses[idx]
+
+    def lookup(self, key, kind='rhyme', source=None):
+        """
+        Find the verses with a rhyme or assonance.
+
+        :param key: The rhyme or assonance, as found by the scansion.
+        :param kind: 'rhyme' for consonant rhymes or 'asson' for assonances.
+        :param source: A source to restrict the verses to, or None for all.
+        :return: A list of ids in the order they were added.
+        """
+        ids = self.__postings[kind].get(key, [])
+        if source is not None:
+            ids = [idx for idx in ids if self.verses[idx]['source'] == source]
+        return list(ids)
+
+    def rhymes(self, rhyme, source=None):
+        """
+        Find the verses with a consonant rhyme.
+
+        :param rhyme: The rhyme, e.g. 'ado'.
+        :param source: A source to restrict the verses to, or None for all.
+        :return: A list of ids.
+        """
+        return self.lookup(rhyme, 'rhyme', source)
+
+    def assonances(self, asson, source=None):
+        """
+        Find the verses with an assonance.
+
+        :param asson: The assonance, e.g. 'aa'.
+        :param source: A source to restrict the verses to, or None for all.
+        :return: A list of ids.
+        """
+        return self.lookup(asson, 'asson', source)
+
+    def keys(self, kind='rhyme', ending=''):
+        """
+        Return the rhymes or assonances in the index, with the number of verses of each.
+
+        :param kind: 'rhyme' or 'asson'.
+        :param ending: An ending the keys must have, e.g. 'ado'.
+        :return: A dictionary of keys and counts, the most frequent first.
+        """
+        counts = {key: len(ids) for key, ids in self.__postings[kind].items() if key.endswith(ending)}
+        return dict(sorted(counts.items(), key=lambda item: -item[1]))
+
+    def scheme(self, ids=None, source=None, kind='rhyme'):
+        """
+        Find the rhyme scheme of consecutive verses.
+
+        Verses sharing a rhyme get the same letter, in order of appearance.
+        Verses whose rhyme does not recur among them get None.
+
+        :param ids: A list of ids, or None for the verses of the source.
+        :param source: The source, if no ids are given.
+        :param kind: 'rhyme' for consonant rhymes or 'asson' for assonances.
+        :return: A list of labels, one for each verse.
+        """
+        if ids is None:
+            ids = self.__sources.get(source, [])
+        return rhyme_scheme([self.verses[idx][kind] for idx in ids])
+
+    def save(self, path):
+        """
+        Save the index as JSON.
+
+        :param path: The path of the file.
+        """
+        verses = [[verse['source'], verse['n'], verse['line'], verse['rhyme'], verse['asson']]
+                  if verse is not None else None for verse in self.verses]
+        with open(path, 'w', encoding='utf-8') as fp:
+            json.dump({'version': version, 'verses': verses}, fp, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an index saved with save.
+
+        The ids of the verses are kept.
+
+        :param path: The path of the file.
+        :return: A RhymeIndex object.
+        """
+        with open(path, encoding='utf-8') as fp:
+            data = json.load(fp)
+        index = cls()
+        for verse in data['verses']:
+            if verse is None:
+                index.verses.append(None)
+                continue
+            source, n, line, rhyme, asson = verse
+            index.add({'line': line, 'rhyme': rhyme, 'asson': asson}, source, n)
+        return index
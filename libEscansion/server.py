@@ -0,0 +1,202 @@
+"""Local scansion server, keeping the pipeline loaded between requests.
+
+The server reads JSON Lines from a Unix socket or a localhost TCP port. Each
+request is an object with the verse and, optionally, its parameters and an id
+that is echoed in the response:
+
+    {"id": 1, "line": "Cerrar podrá mis ojos la postrera", "expected_syl": [11, 7]}
+
+and each response holds the fields of VerseMetre, or an error. The responses
+of a connection keep the order of its requests, but the verses of all the
+connections are scanned together by micro-batches. The request
+{"op": "health"} returns the counters of the server. On TCP, the server also
+answers GET /health and POST /scan, whose body is JSON Lines:
+
+    escansion-server --socket /tmp/escansion.sock
+    escansion-server --port 8765 --max-batch 64 --max-wait 0.005
+"""
+import sys
+import json
+import time
+import asyncio
+import argparse
+from .libEscansion import get_pipeline, version
+from .aio import AsyncScanner
+
+
+class ScansionServer:
+    """
+    A class to serve the scansion of verses over a local socket.
+    """
+
+    def __init__(self, scanner=None, window=256):
+        """
+        Initialize the ScansionServer class.
+
+        :param scanner: The AsyncScanner scanning the verses, or None for a compact one.
+        :param window: The maximum requests of a connection being answered; no more are read until they are sent.
+        """
+        self.scanner = scanner or AsyncScanner(compact=True)
+        self.window = window
+        self.started = time.time()
+        self.connections = self.requests = self.errors = 0
+
+    def health(self):
+        """
+        Return the counters of the server.
+
+        :return: A dictionary with the status, the counters and the throughput.
+        """
+        uptime = time.time() - self.started
+        return {'status': 'ok', 'version': version, 'uptime': uptime,
+                'connections': self.connections, 'requests': self.requests, 'errors': self.errors,
+                'verses': self.scanner.verses, 'batches': self.scanner.batches,
+                'pending': self.scanner.pending(),
+                'verses_per_second': self.scanner.verses / uptime if uptime else 0.0}
+
+    async def respond(self, row):
+        """
+        Answer a request.
+
+        :param row: A line of JSON.
+        :return: The response, as a dictionary.
+        """
+        try:
+            request = json.loads(row)
+        except ValueError as error:
+            self.errors += 1
+            return {'error': f'invalid request: {error}'}
+        if not isinstance(request, dict):
+            self.errors += 1
+            return {'error': 'invalid request: expected a JSON object'}
+        if request.get('op') == 'health':
+            return self.health()
+        self.requests += 1
+        response = {'id': request['id']} if 'id' in request else {}
+        try:
+            verse = await self.scanner.scan(request['line'], request.get('expected_syl') or False,
+                                            request.get('adso', False))
+        except Exception as error:
+            self.errors += 1
+            response['error'] = f'{type(error).__name__}: {error}'
+        else:
+            response.update(verse.to_dict())
+        return response
+
+    async def handle(self, reader, writer):
+        """
+        Serve a connection.
+
+        :param reader: The asyncio.StreamReader of the connection.
+        :param writer: The asyncio.StreamWriter of the connection.
+        """
+        self.connections += 1
+        try:
+            first = await reader.readline()
+            if first.startswith((b'GET ', b'POST ')):
+                await self.__http(first, reader, writer)
+                return
+            responses = asyncio.Queue(self.window)
+            sender = asyncio.create_task(self.__send(responses, writer))
+            row = first
+            while row:
+                if row.strip():
+                    await responses.put(asyncio.create_task(self.respond(row)))
+                row = await reader.readline()
+            await responses.put(None)
+            await sender
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def __send(self, responses, writer):
+        while (response := await responses.get()) is not None:
+            try:
+                response = await response
+            except Exception as error:
+                self.errors += 1
+                response = {'error': f'{type(error).__name__}: {error}'}
+            writer.write(json.dumps(response, ensure_ascii=False).encode() + b'\n')
+            await writer.drain()
+
+    async def __http(self, first, reader, writer):
+        try:
+            method, path = first.decode('latin-1').split()[:2]
+            length = 0
+            while (header := await reader.readline()).strip():
+                name, _, value = header.decode('latin-1').partition(':')
+                if name.strip().lower() == 'content-length':
+                    length = int(value)
+                    if length < 0:
+                        raise ValueError(f'negative Content-Length: {length}')
+            rows = (await reader.readexactly(length)).decode().splitlines() if method == 'POST' else []
+        except (ValueError, asyncio.IncompleteReadError) as error:
+            self.errors += 1
+            method = path = None
+            status = '400 Bad Request'
+            body = json.dumps({'error': f'bad request: {type(error).__name__}: {error}'}).encode() + b'\n'
+        if method == 'GET' and path == '/health':
+            status, body = '200 OK', json.dumps(self.health()).encode() + b'\n'
+        elif method == 'POST' and path == '/scan':
+            rows = [row for row in rows if row.strip()]
+            responses = []
+            for start in range(0, len(rows), self.window):
+                responses += await asyncio.gather(*[self.respond(row) for row in rows[start:start + self.window]],
+                                                  return_exceptions=True)
+            responses = [{'error': f'{type(response).__name__}: {response}'}
+                         if isinstance(response, Exception) else response for response in responses]
+            status = '200 OK'
+            body = b''.join(json.dumps(response, ensure_ascii=False).encode() + b'\n' for response in responses)
+        elif method is not None:
+            status, body = '404 Not Found', b'{"error": "not found"}\n'
+        writer.write(f'HTTP/1.1 {status}\r\nContent-Type: application/x-ndjson\r\n'
+                     f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode() + body)
+        await writer.drain()
+
+    async def serve(self, socket=None, host='127.0.0.1', port=8765):
+        """
+        Serve until cancelled.
+
+        :param socket: The path of a Unix socket, or None to listen on TCP.
+        :param host: The host to listen on.
+        :param port: The port to listen on.
+        """
+        if socket:
+            server = await asyncio.start_unix_server(self.handle, path=socket)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.scanner.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='escansion-server', description='Local scansion server.')
+    parser.add_argument('-S', '--socket', help='path of a Unix socket to listen on')
+    parser.add_argument('-H', '--host', default='127.0.0.1', help='host to listen on')
+    parser.add_argument('-P', '--port', type=int, default=8765, help='port to listen on')
+    parser.add_argument('-b', '--max-batch', type=int, default=64, help='maximum verses in a batch')
+    parser.add_argument('-t', '--max-wait', type=float, default=0.005, help='seconds a batch waits for more verses')
+    parser.add_argument('-q', '--max-pending', type=int, default=4096, help='maximum verses waiting to be scanned')
+    parser.add_argument('-w', '--window', type=int, default=256,
+                        help='maximum requests of a connection being answered at once')
+    args = parser.parse_args(argv)
+
+    get_pipeline()
+
+    async def serve():
+        scanner = AsyncScanner(args.max_batch, args.max_wait, args.max_pending, compact=True)
+        await ScansionServer(scanner, args.window).serve(args.socket, args.host, args.port)
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""Vectorized statistics over scansion results.
+
+The results of a batch (VerseMetre or Scansion objects, or their dictionaries)
+are turned into NumPy arrays once, and the statistics are computed over the
+arrays. NumPy is only required by this module:
+
+    >>> from libEscansion import stats
+    >>> arrays = stats.ScansionArrays.from_results(verses, groups=plays)
+    >>> stats.metre_histogram(arrays)
+    >>> stats.stress_probabilities(arrays, count=11)
+"""
+import numpy as np
+
+# Numeric fields kept as columns
+numeric = ('count', 'natural', 'estimate', 'ambiguity')
+
+
+def _field(result, field):
+    value = result[field] if isinstance(result, dict) else getattr(result, field)
+    return value or (0 if field in numeric else '')
+
+
+def encode(values):
+    """
+    Encode values as categorical codes.
+
+    :param values: An iterable of hashable values.
+    :return: A tuple with an int32 array of codes and the list of categories, in order of appearance.
+    """
+    table = {}
+    codes = np.fromiter((table.setdefault(value, len(table)) for value in values), dtype=np.int32)
+    return codes, list(table)
+
+
+def stress_matrix(rhythms, width=None):
+    """
+    Build the stress matrix of a list of rhythms.
+
+    :param rhythms: A list of rhythm strings, with '+' for stressed syllables.
+    :param width: The number of syllable positions, or None for the longest rhythm.
+    :return: A tuple with a boolean matrix (verses x positions) and an array with the lengths of the rhythms.
+    """
+    lengths = np.fromiter((len(rhythm) for rhythm in rhythms), dtype=np.int32, count=len(rhythms))
+    width = int(lengths.max(initial=0)) if width is None else width
+    matrix = np.zeros((len(rhythms), width), dtype=bool)
+    buffer = np.frombuffer(''.join(rhythms).encode('ascii'), dtype=np.uint8)
+    rows = np.repeat(np.arange(len(rhythms)), lengths)
+    positions = np.arange(len(buffer)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    inside = positions < width
+    matrix[rows[inside], positions[inside]] = buffer[inside] == ord('+')
+    return matrix, lengths
+
+
+class ScansionArrays:
+    """
+    A class to represent the results of a batch of verses as NumPy arrays.
+    """
+
+    def __init__(self, count, natural, estimate, ambiguity, rhythms, asson, rhyme, groups=None):
+        """
+        Build the arrays from the columns of the results.
+
+        :param count: The syllable counts.
+        :param natural: The natural counts.
+        :param estimate: The estimated counts.
+        :param ambiguity: The ambiguities.
+        :param rhythms: The rhythm strings.
+        :param asson: The assonances.
+        :param rhyme: The consonant rhymes.
+        :param groups: Optional labels of the verses, such as their play or author.
+        """
+        self.count = np.asarray(count, dtype=np.int16)
+        self.natural = np.asarray(natural, dtype=np.int16)
+        self.estimate = np.asarray(estimate, dtype=np.int16)
+        self.ambiguity = np.asarray(ambiguity, dtype=np.int16)
+        self.stress, self.length = stress_matrix(list(rhythms))
+        self.asson, self.assonances = encode(asson)
+        self.rhyme, self.rhymes = encode(rhyme)
+        if groups is None:
+            groups = [''] * len(self.count)
+        self.group, self.groups = encode(groups)
+
+    @classmethod
+    def from_results(cls, results, groups=None):
+        """
+        Build the arrays from scansion results.
+
+        :param results: An iterable of VerseMetre or Scansion objects, or of their dictionaries.
+        :param groups: Optional labels of the verses, such as their play or author.
+        :return: A ScansionArrays object.
+        """
+        results = list(results)
+        columns = {field: [_field(result, field) for result in results]
+                   for field in numeric + ('rhythm', 'asson', 'rhyme')}
+        return cls(columns['count'], columns['natural'], columns['estimate'], columns['ambiguity'],
+                   columns['rhythm'], columns['asson'], columns['rhyme'], groups)
+
+    def __len__(self):
+        return len(self.count)
+
+    @property
+    def patterns(self):
+        """
+        Return the stress pattern of every verse as a bitmask, the first syllable in the lowest bit.
+
+        :return: A uint64 array; positions beyond the 64th are ignored.
+        """
+        width = min(self.stress.shape[1], 64)
+        weights = np.left_shift(np.uint64(1), np.arange(width, dtype=np.uint64))
+        return (self.stress[:, :width] * weights).sum(axis=1, dtype=np.uint64)
+
+    def mask(self, count=None, group=None):
+        """
+        Select verses by count and group.
+
+        :param count: A syllable count, or None for all.
+        :param group: A group label, or None for all.
+        :return: A boolean array.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if count is not None:
+            mask &= self.count == count
+        if group is not None:
+            mask &= self.group == (self.groups.index(group) if group in self.groups else -1)
+        return mask
+
+
+def metre_histogram(arrays, by_group=False):
+    """
+    Count the verses of every syllable count.
+
+    :param arrays: A ScansionArrays object.
+    :param by_group: Boolean to count the verses of every group apart.
+    :return: An array indexed by count, or a matrix (groups x counts).
+    """
+    size = int(arrays.count.max(initial=0)) + 1
+    if not by_group:
+        return np.bincount(arrays.count, minlength=size)
+    index = arrays.group.astype(np.int64) * size + arrays.count
+    return np.bincount(index, minlength=len(arrays.groups) * size).reshape(len(arrays.groups), size)
+
+
+def stress_probabilities(arrays, count=None, group=None):
+    """
+    Compute the probability of stress at every syllable position.
+
+    :param arrays: A ScansionArrays object.
+    :param count: A syllable count to restrict the verses to, or None for all.
+    :param group: A group label to restrict the verses to, or None for all.
+    :return: A float array indexed by position; NaN where no verse reaches the position.
+    """
+    mask = arrays.mask(count, group)
+    stressed = arrays.stress[mask].sum(axis=0)
+    reached = (arrays.length[mask, None] > np.arange(arrays.stress.shape[1])).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return stressed / reached
+
+
+def tally(codes, categories):
+    """
+    Count the occurrences of categorical codes.
+
+    :param codes: An array of codes, e.g. ScansionArrays.asson.
+    :param categories: The categories of the codes, e.g. ScansionArrays.assonances.
+    :return: A dictionary of categories and counts, the most frequent first.
+    """
+    counts = np.bincount(codes, minlength=len(categories))
+    return {categories[idx]: int(counts[idx]) for idx in np.argsort(-counts, kind='stable') if counts[idx]}
+
+
+def stress_profiles(arrays, count=None):
+    """
+    Compute the stress probabilities of every group.
+
+    :param arrays: A ScansionArrays object.
+    :param count: A syllable count to restrict the verses to, or None for all.
+    :return: A matrix (groups x positions), with 0 where no verse reaches the position.
+    """
+    mask = arrays.mask(count)
+    groups, stress = arrays.group[mask], arrays.stress[mask]
+    reached = arrays.length[mask, None] > np.arange(stress.shape[1])
+    stressed = np.zeros((len(arrays.groups), stress.shape[1]))
+    totals = np.zeros_like(stressed)
+    np.add.at(stressed, groups, stress)
+    np.add.at(totals, groups, reached)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.nan_to_num(stressed / totals)
+
+
+def cluster(arrays, k, count=None, iterations=100, seed=0):
+    """
+    Cluster the groups by their stress profiles with k-means.
+
+    :param arrays: A ScansionArrays object.
+    :param k: The number of clusters.
+    :param count: A syllable count to restrict the verses to, or None for all.
+    :param iterations: The maximum number of iterations.
+    :param seed: The seed of the initial centroids.
+    :return: A tuple with a dictionary of groups and clusters, and the matrix of centroids.
+    """
+    profiles = stress_profiles(arrays, count)
+    present = np.bincount(arrays.group[arrays.mask(count)], minlength=len(arrays.groups)) > 0
+    profiles, names = profiles[present], [name for name, kept in zip(arrays.groups, present) if kept]
+    k = min(k, len(profiles))
+    centroids = profiles[np.random.default_rng(seed).choice(len(profiles), k, replace=False)]
+    labels = np.zeros(len(profiles), dtype=np.int64)
+    for iteration in range(iterations):
+        distances = ((profiles[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+        new_labels = distances.argmin(axis=1)
+        if iteration and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for idx in range(k):
+            if (labels == idx).any():
+                centroids[idx] = profiles[labels == idx].mean(axis=0)
+    return dict(zip(names, labels.tolist())), centroids
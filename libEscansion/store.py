@@ -0,0 +1,130 @@
+"""Persistent store of scansion results in a local SQLite file."""
+import json
+import sqlite3
+from .libEscansion import VerseMetre, version
+
+fields = VerseMetre.fields
+
+
+class ResultStore:
+    """
+    Store of scanned verses keyed by the verse, its parameters and the library version.
+
+    Entries written by another version of the library are discarded when the
+    store is opened. If a maximum size is given, the least recently used
+    entries are evicted once it is exceeded.
+    """
+
+    def __init__(self, path, max_entries=None):
+        """
+        Initialize the ResultStore class.
+
+        :param path: The path of the SQLite file.
+        :param max_entries: The maximum number of verses kept, or None for no limit.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.__db = sqlite3.connect(path)
+        self.__db.executescript('''
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS verses (
+                line TEXT, expected TEXT, adso INTEGER, version TEXT,
+                result TEXT, used INTEGER,
+                PRIMARY KEY (line, expected, adso, version));
+            CREATE INDEX IF NOT EXISTS verses_used ON verses (used);
+        ''')
+        stored = self.__db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if not stored or stored[0] != version:
+            self.__db.execute('DELETE FROM verses')
+            self.__db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (version,))
+            self.__db.commit()
+        self.__clock, self.__size = self.__db.execute(
+            'SELECT COALESCE(MAX(used), 0), COUNT(*) FROM verses').fetchone()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self.__size
+
+    @staticmethod
+    def key(line, expected_syl=False, adso=False):
+        """
+        Build the key of a verse and its scansion parameters.
+
+        :param line: The verse.
+        :param expected_syl: The list of expected syllable counts.
+        :param adso: Boolean for 'adso' scansion.
+        :return: A tuple with the normalized verse, the expected counts, adso and the version.
+        """
+        return ' '.join(line.split()), json.dumps(expected_syl or []), int(bool(adso)), version
+
+    def get(self, line, expected_syl=False, adso=False):
+        """
+        Return the stored scansion of a verse.
+
+        :param line: The verse.
+        :param expected_syl: The list of expected syllable counts.
+        :param adso: Boolean for 'adso' scansion.
+        :return: A VerseMetre object restored from the store, or None.
+        """
+        key = self.key(line, expected_syl, adso)
+        row = self.__db.execute('SELECT result FROM verses WHERE line = ? AND expected = ? '
+                                'AND adso = ? AND version = ?', key).fetchone()
+        if row is None:
+            return None
+        self.__clock += 1
+        self.__db.execute('UPDATE verses SET used = ? WHERE line = ? AND expected = ? '
+                          'AND adso = ? AND version = ?', (self.__clock,) + key)
+        return self.restore(line, adso, json.loads(row[0]))
+
+    def put(self, verse, expected_syl=False):
+        """
+        Store the scansion of a verse.
+
+        :param verse: A VerseMetre object.
+        :param expected_syl: The list of expected syllable counts it was scanned with.
+        """
+        key = self.key(verse.line, expected_syl, verse.adso)
+        result = json.dumps({field: getattr(verse, field) for field in fields}, ensure_ascii=False)
+        self.__clock += 1
+        cursor = self.__db.execute('INSERT OR IGNORE INTO verses VALUES (?, ?, ?, ?, ?, ?)',
+                                   key + (result, self.__clock))
+        if cursor.rowcount == 1:
+            self.__size += 1
+        else:
+            self.__db.execute('UPDATE verses SET result = ?, used = ? WHERE line = ? AND expected = ? '
+                              'AND adso = ? AND version = ?', (result, self.__clock) + key)
+        if self.max_entries is not None and self.__size > self.max_entries:
+            self.__db.execute('DELETE FROM verses WHERE rowid IN '
+                              '(SELECT rowid FROM verses ORDER BY used LIMIT ?)',
+                              (self.__size - self.max_entries,))
+            self.__size = self.max_entries
+
+    def commit(self):
+        """Write the pending changes to disk."""
+        self.__db.commit()
+
+    def close(self):
+        """Write the pending changes and close the file."""
+        self.__db.commit()
+        self.__db.close()
+
+    @staticmethod
+    def restore(line, adso, result):
+        """
+        Build a VerseMetre object from stored results without scanning the verse.
+
+        :param line: The verse.
+        :param adso: Boolean for 'adso' scansion.
+        :param result: A dictionary with the stored fields.
+        :return: A VerseMetre object.
+        """
+        verse = VerseMetre.__new__(VerseMetre)
+        verse.line, verse.adso, verse.words, verse.metrics = line, adso, [], None
+        for field in fields:
+            setattr(verse, field, result[field])
+        return verse
@@ -0,0 +1,46 @@
+"""Incremental reading of verses from XML-TEI files."""
+from xml.etree.ElementTree import iterparse
+
+containers = ('lg', 'sp', 'div', 'body')
+
+
+def _name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def iter_tei(path):
+    """
+    Read the verses (<l> elements) of a TEI file without loading the whole tree.
+
+    The elements are released as soon as they have been read.
+
+    :param path: The path of the file.
+    :return: A generator of (source, number, verse, document, attributes) tuples.
+    """
+    number = 0
+    for _, element in iterparse(path, events=('end',)):
+        name = _name(element.tag)
+        if name == 'l':
+            number += 1
+            line = ' '.join(''.join(element.itertext()).split())
+            attributes = {_name(key): value for key, value in element.attrib.items()}
+            element.clear()
+            yield path, number, line, None, attributes
+        elif name in containers:
+            element.clear()
+
+
+def rhythm_matches(rhythm, met):
+    """
+    Compare a rhythm with the metre annotated in the corpus.
+
+    A final unstressed syllable beyond the eleventh one is not annotated in
+    ADSO, so it is ignored.
+
+    :param rhythm: The rhythm found by the scansion.
+    :param met: The annotated metre.
+    :return: True if they match.
+    """
+    if len(rhythm) > len(met) and len(met) == 11:
+        rhythm = rhythm[:-1]
+    return rhythm == met
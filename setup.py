@@ -35,5 +35,11 @@ setup(
         "Programming Language :: Python :: 3.9",
         "Natural Language :: Spanish",
     ],
-    packages=find_packages(include=['libEscansion', 'libEscansion.*'])
+    packages=find_packages(include=['libEscansion', 'libEscansion.*']),
+    package_data={'libEscansion': ['data/*.tsv']},
+    extras_require={'stats': ['numpy']},
+    entry_points={
+        'console_scripts': ['escansion = libEscansion.cli:main',
+                            'escansion-server = libEscansion.server:main'],
+    },
 )
@@ -0,0 +1,79 @@
+"""Corpus and results recorded for the tests.
+
+data/verses.conllu holds verses tagged once, so that the tests need neither
+Stanza nor its models. data/scansion.json.gz holds the results of every verse
+for several expected counts, with and without adso, and data/synaloephas.json.gz
+the syllables of random verses after applying their synaloephas and hiatuses
+one by one. Both were recorded with the original recursive implementation of
+the search of the metre.
+
+Only after a deliberate change of the results, the scansion can be recorded
+again from the current implementation with:
+
+    python tests/recorded.py
+"""
+import sys
+import gzip
+import json
+import pathlib
+
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1]))
+
+from libEscansion import VerseMetre
+from libEscansion.annotations import read_conllu
+
+data = pathlib.Path(__file__).parent / 'data'
+
+
+def load(name):
+    """
+    Load a gzipped JSON file of the test data.
+
+    :param name: The name of the file.
+    :return: The decoded data.
+    """
+    with gzip.open(data / name, 'rt', encoding='utf-8') as fp:
+        return json.load(fp)
+
+
+def verses():
+    """
+    Read the tagged verses.
+
+    :return: A list of (verse, document) tuples.
+    """
+    with open(data / 'verses.conllu', encoding='utf-8') as fp:
+        return list(read_conllu(fp))
+
+
+def scan(line, doc, expected_syl, adso):
+    """
+    Scan a verse and return its results as recorded.
+
+    :param line: The verse.
+    :param doc: The tagged document of the verse.
+    :param expected_syl: The list of expected syllable counts, as in VerseMetre.
+    :param adso: Boolean to trigger specific behavior for 'adso' cases.
+    :return: A list with the results, or with 'EXC' and the name of the exception raised.
+    """
+    try:
+        verse = VerseMetre(line, expected_syl, adso, doc=doc)
+    except Exception as error:
+        return ['EXC', type(error).__name__]
+    return json.loads(json.dumps([getattr(verse, field) for field in VerseMetre.fields], ensure_ascii=False))
+
+
+def record():
+    """Record the results of the scansion of the tagged verses."""
+    snapshot = load('scansion.json.gz')
+    expected = snapshot['expected']
+    results = [{'line': line, 'results': [[scan(line, doc, counts, adso) for adso in (False, True)]
+                                          for counts in expected]}
+               for line, doc in verses()]
+    with gzip.GzipFile(data / 'scansion.json.gz', 'wb', mtime=0) as fp:
+        fp.write(json.dumps({'expected': expected, 'verses': results},
+                            ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+if __name__ == '__main__':
+    record()
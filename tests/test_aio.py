@@ -0,0 +1,52 @@
+"""The default asynchronous scanner, closed with its event loop."""
+import asyncio
+import threading
+import pytest
+from recorded import verses
+from libEscansion import VerseMetre, ascan, aio, libEscansion
+from libEscansion.libEscansion import prepare_line
+
+tagged = verses()[:16]
+
+
+class RecordedPipeline:
+    """A pipeline returning the recorded documents of the verses."""
+
+    def __init__(self):
+        self.docs = {prepare_line(line): doc for line, doc in tagged}
+
+    def __call__(self, docs):
+        return [self.docs[doc.text] for doc in docs]
+
+
+@pytest.fixture
+def pipeline():
+    previous = libEscansion._pipeline
+    libEscansion.set_pipeline(RecordedPipeline())
+    yield
+    libEscansion.set_pipeline(previous)
+
+
+def scanner_threads():
+    return [thread for thread in threading.enumerate() if thread.name.startswith('libEscansion')]
+
+
+def test_default_scanner_closed(pipeline):
+    async def scan():
+        return await asyncio.gather(*(ascan(line) for line, doc in tagged), return_exceptions=True)
+
+    threads = scanner_threads()
+    for _ in range(3):
+        results = asyncio.run(scan())
+        assert not aio._scanners
+        for (line, doc), result in zip(tagged, results):
+            try:
+                expected = VerseMetre(line, doc=doc).to_dict()
+            except IndexError:
+                assert isinstance(result, IndexError)
+            else:
+                assert result.to_dict() == expected
+    for thread in scanner_threads():
+        if thread not in threads:
+            thread.join(1)
+    assert len(scanner_threads()) == len(threads)
@@ -0,0 +1,43 @@
+"""Alternative scansions of the verses, within and across their expected counts."""
+import pytest
+from recorded import verses
+from libEscansion import VerseMetre
+
+tagged = verses()[::4]
+
+
+@pytest.mark.parametrize('line, doc', tagged, ids=range(len(tagged)))
+def test_alternatives(line, doc):
+    try:
+        verse = VerseMetre(line, [11, 7, 10, 12], doc=doc)
+    except IndexError:
+        return
+    alternatives = verse.alternatives(k=8)
+    assert alternatives
+    assert [alternative.score for alternative in alternatives] == \
+           sorted((alternative.score for alternative in alternatives), reverse=True)
+    assert len({tuple(map(tuple, alternative.syllables)) for alternative in alternatives}) == len(alternatives)
+    assert any(alternative.syllables == verse.syllables for alternative in alternatives
+               if alternative.count == verse.count)
+
+    length = sum(len(word) for word in verse.words)
+    for alternative in alternatives:
+        assert alternative.score <= 0
+        assert alternative.rhythm == verse.find_rhyhtm(alternative.nuclei)
+        contracted = alternative.contracted is not None
+        positions = alternative.synaloephas + alternative.hiatuses + [alternative.contracted] * contracted
+        assert all(0 <= idx < len(verse.words) and 0 <= idy < len(verse.words[idx]) for idx, idy in positions)
+        assert sum(len(word) for word in alternative.syllables) == \
+               length - len(alternative.synaloephas) + len(alternative.hiatuses) - contracted
+
+
+def test_alternatives_within_count():
+    found = 0
+    for line, doc in tagged:
+        try:
+            verse = VerseMetre(line, [11, 7, 10, 12], doc=doc)
+        except IndexError:
+            continue
+        counts = [alternative.count for alternative in verse.alternatives(k=8)]
+        found += len(set(counts)) < len(counts)
+    assert found
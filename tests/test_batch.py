@@ -0,0 +1,38 @@
+"""Scansion of several verses when some of them cannot be scanned."""
+import pytest
+from recorded import load, verses, scan
+from libEscansion import VerseMetre, Scansion, scan_annotated, scan_verse
+
+snapshot = load('scansion.json.gz')
+tagged = verses()[:64]
+expected_syl = [8]
+recorded = [verse['results'][snapshot['expected'].index(expected_syl)][0] for verse in snapshot['verses'][:64]]
+
+
+def test_errors_raise():
+    with pytest.raises(IndexError):
+        list(scan_annotated(tagged, expected_syl))
+
+
+def test_errors_return():
+    results = list(scan_annotated(tagged, expected_syl, errors='return'))
+    assert len(results) == len(tagged)
+    assert any(isinstance(result, IndexError) for result in results)
+    assert any(isinstance(result, VerseMetre) for result in results)
+    for (line, doc), result, record in zip(tagged, results, recorded):
+        if isinstance(result, Exception):
+            assert record == ['EXC', type(result).__name__]
+        else:
+            assert scan(line, doc, expected_syl, False) == record
+
+
+def test_errors_return_compact():
+    results = list(scan_annotated(tagged, expected_syl, compact=True, errors='return'))
+    assert [type(result) for result in results] == \
+           [IndexError if record[0] == 'EXC' else Scansion for record in recorded]
+
+
+def test_errors_invalid():
+    line, doc = tagged[0]
+    with pytest.raises(ValueError):
+        scan_verse(line, expected_syl, doc=doc, errors='ignore')
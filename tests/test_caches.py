@@ -0,0 +1,55 @@
+"""Scansion with the caches cold, warm and too small to hold the verses."""
+from math import sqrt
+import pytest
+from recorded import load, verses, scan
+from libEscansion import libEscansion
+from libEscansion.libEscansion import trapez, distances, junction_scores, junction_merges, transcriptions, \
+    parse_syllable, clear_caches
+
+snapshot = load('scansion.json.gz')
+tagged = verses()[::8]
+recorded = snapshot['verses'][::8]
+
+
+def scan_all():
+    return [[[scan(line, doc, expected_syl, adso) for adso in (False, True)] for expected_syl in snapshot['expected']]
+            for line, doc in tagged]
+
+
+@pytest.fixture
+def sizes():
+    maxsizes = [cache.maxsize for cache in (junction_scores, junction_merges, transcriptions)]
+    yield
+    for cache, maxsize in zip((junction_scores, junction_merges, transcriptions), maxsizes):
+        cache.resize(maxsize)
+
+
+def test_distances():
+    for onset in trapez:
+        for coda in trapez:
+            assert distances[onset, coda] == sqrt((trapez[onset][0] - trapez[coda][0]) ** 2 +
+                                                  (trapez[onset][1] - trapez[coda][1]) ** 2)
+
+
+def test_cold_and_warm():
+    clear_caches()
+    assert scan_all() == [verse['results'] for verse in recorded]
+    hits = junction_scores.hits
+    assert scan_all() == [verse['results'] for verse in recorded]
+    assert junction_scores.hits > hits
+
+
+def test_evictions(sizes):
+    for cache in (junction_scores, junction_merges, transcriptions):
+        cache.resize(2)
+    assert scan_all() == [verse['results'] for verse in recorded]
+    assert junction_scores.evictions and junction_merges.evictions
+
+
+def test_clear_caches():
+    scan(*tagged[0], [11, 7], False)
+    clear_caches()
+    for cache in (junction_scores, junction_merges, transcriptions):
+        assert cache.stats() == {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'maxsize': cache.maxsize}
+    assert parse_syllable.cache_info().currsize == 0
+    assert libEscansion.clear_caches is clear_caches
@@ -0,0 +1,27 @@
+"""Scansion of CoNLL-U corpora, which needs neither Stanza nor its models."""
+import sys
+import pathlib
+import subprocess
+from recorded import verses
+
+root = pathlib.Path(__file__).parents[1]
+corpus = pathlib.Path(__file__).parent / 'data' / 'verses.conllu'
+
+# Stanza cannot be imported, and the workers inherit it when forked
+script = '''
+import sys
+sys.modules['stanza'] = None
+from libEscansion.corpus import CorpusScan, read_verses, scan_verses
+path = sys.argv[1]
+results = scan_verses(list(read_verses(path)))
+results += list(CorpusScan([path], workers=2, size=128))
+assert not any('ImportError' in result.get('error', '') for result in results)
+assert not any(name == 'torch' or name.startswith('stanza.') for name in sys.modules)
+print(len(results))
+'''
+
+
+def test_conllu_without_stanza():
+    process = subprocess.run([sys.executable, '-c', script, str(corpus)], cwd=root, capture_output=True, text=True)
+    assert process.returncode == 0, process.stderr
+    assert int(process.stdout) == 2 * len(verses())
@@ -0,0 +1,41 @@
+"""Measures of the verses scanned, those that fail included."""
+import pytest
+from recorded import verses
+from libEscansion import VerseMetre, instrumentation
+
+tagged = verses()[:64]
+
+
+@pytest.fixture
+def enabled():
+    instrumentation.reset()
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_failed_verses(enabled):
+    failed = 0
+    for line, doc in tagged:
+        try:
+            VerseMetre(line, [8], doc=doc)
+        except IndexError:
+            failed += 1
+    summary = instrumentation.summary()
+    assert 0 < failed < len(tagged)
+    assert summary['verses'] == len(tagged) and summary['failed'] == failed
+    assert summary['counts']['adjust_metre_depth'] >= len(tagged)
+
+
+def test_failed_deferred(enabled):
+    verses = [VerseMetre(line, [8], doc=doc, deferred=True) for line, doc in tagged]
+    assert instrumentation.summary()['verses'] == 0
+    failed = 0
+    for verse in verses:
+        try:
+            verse.scan([8])
+        except IndexError:
+            failed += 1
+    assert instrumentation.summary()['verses'] == len(tagged)
+    assert instrumentation.summary()['failed'] == failed > 0
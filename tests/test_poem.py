@@ -0,0 +1,39 @@
+"""Scansion of the blocks of a play when some of their verses cannot be scanned."""
+from recorded import verses
+from libEscansion import VerseMetre, PlayScan
+from libEscansion.poem import block_metres, verse_hint
+
+tagged = verses()[:16]
+
+
+def deferred(candidates):
+    return [VerseMetre(line, candidates, doc=doc, deferred=True) for line, doc in tagged]
+
+
+def test_scan_block():
+    play = PlayScan([])
+    block = play.scan_block(deferred(play.candidates))
+    metres = block_metres([verse.estimate for verse in deferred(play.candidates)], play.candidates)
+    assert play.metres == [metres]
+    for position, verse in enumerate(deferred(play.candidates)):
+        try:
+            verse.scan(verse_hint(verse.estimate, metres, play.candidates))
+        except IndexError as error:
+            assert block[position] is None and play.errors[0][position] == f'IndexError: {error}'
+            continue
+        assert position not in play.errors[0]
+        assert (block[position].count, block[position].rhythm) == (verse.count, verse.rhythm)
+
+
+def test_scan_block_errors():
+    play = PlayScan([], [8])
+    verses = deferred(play.candidates)
+    verses[3] = ValueError('untagged verse')
+    block = play.scan_block(verses)
+    assert len(block) == len(verses) and block[3] is None
+    errors = play.errors[0]
+    assert errors[3] == 'ValueError: untagged verse'
+    assert len(errors) > 1 and all(block[position] is None for position in errors)
+    assert all(verse.count == 8 for position, verse in enumerate(block) if position not in errors)
+    play.blocks.append(block)
+    assert [play.error(idx) for idx in range(len(block))] == [errors.get(idx) for idx in range(len(block))]
@@ -0,0 +1,23 @@
+"""Scansion of the tagged corpus, compared with the results recorded from the original implementation."""
+import pytest
+from recorded import load, verses, scan
+
+snapshot = load('scansion.json.gz')
+tagged = verses()
+
+
+@pytest.mark.parametrize('idx', range(len(tagged)))
+def test_scansion(idx):
+    line, doc = tagged[idx]
+    recorded = snapshot['verses'][idx]
+    assert recorded['line'] == line
+    for expected_syl, results in zip(snapshot['expected'], recorded['results']):
+        for adso, result in zip((False, True), results):
+            assert scan(line, doc, expected_syl, adso) == result, (expected_syl, adso)
+
+
+def test_documents_unchanged():
+    line, doc = tagged[0]
+    words = [(word.text, word.upos) for sentence in doc.sentences for word in sentence.words]
+    scan(line, doc, [11, 7], False)
+    assert [(word.text, word.upos) for sentence in doc.sentences for word in sentence.words] == words
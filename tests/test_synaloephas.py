@@ -0,0 +1,35 @@
+"""Synaloephas and hiatuses applied one by one, compared with those recorded from the recursive implementation."""
+import copy
+import pytest
+from recorded import load
+from libEscansion import VerseMetre
+from libEscansion.libEscansion import SyllableArray
+
+cases = load('synaloephas.json.gz')
+
+
+def search(syllables):
+    verse = VerseMetre.__new__(VerseMetre)
+    verse.metrics = None
+    return verse, verse._VerseMetre__metre_search(SyllableArray(copy.deepcopy(syllables)))
+
+
+@pytest.mark.parametrize('idx', range(len(cases)))
+def test_merged(idx):
+    verse, metre_search = search(cases[idx]['syllables'])
+    for count, recorded in enumerate(cases[idx]['merged']):
+        assert verse._VerseMetre__merged(metre_search, count) == recorded, count
+
+
+@pytest.mark.parametrize('idx', range(len(cases)))
+def test_split(idx):
+    verse, metre_search = search(cases[idx]['syllables'])
+    for count, recorded in enumerate(cases[idx]['split']):
+        assert verse._VerseMetre__split(metre_search, count) == recorded, count
+
+
+def test_merged_out_of_order():
+    verse, metre_search = search(cases[0]['syllables'])
+    counts = range(len(cases[0]['merged']))
+    assert [verse._VerseMetre__merged(metre_search, count) for count in reversed(counts)][::-1] == \
+        cases[0]['merged']